@@ -0,0 +1,137 @@
+"""ai_inference.py
+
+Author: Caio Batista de Melo
+Date Created: 2026-10-19
+Date Modified: 2026-10-19
+Description: Batches the move requests of concurrent AI games into one evaluation.
+"""
+
+from concurrent.futures import Future
+from os import getenv
+from queue import Empty, Queue
+from threading import Lock, Thread
+from time import monotonic
+
+from batch_playout import BatchPlayout
+
+# Random playouts per candidate move, how long to wait for other games to join a
+# batch and the most requests a batch can hold.
+AI_PLAYOUTS = int(getenv("AI_PLAYOUTS", 32))
+AI_BATCH_WINDOW = float(getenv("AI_BATCH_WINDOW_MS", 5)) / 1000
+AI_MAX_BATCH = int(getenv("AI_MAX_BATCH", 64))
+# Seconds a request waits for its move before giving up.
+AI_TIMEOUT = float(getenv("AI_TIMEOUT", 10))
+
+_service = None
+_service_lock = Lock()
+
+
+def score_moves(boards, playouts=AI_PLAYOUTS, seed=None):
+    """Returns the legal moves of each board with their values for the player to move.
+
+    The values are estimated with random playouts (1 is a sure win and -1 a sure
+    loss), and the candidates of every board are played out in a single batch.
+    """
+    candidates = []
+    positions = []
+    for board in boards:
+        moves = board.get_legal_moves()
+        candidates.append(moves)
+        for move in moves:
+            after = board.copy()
+            after.make_move(*move)
+            positions.append(after)
+
+    batch = BatchPlayout.from_boards(positions, playouts, seed)
+    batch.run()
+    values = batch.get_values(playouts)
+
+    scores = []
+    end = 0
+    for board, moves in zip(boards, candidates):
+        start, end = end, end + len(moves)
+        sign = 1 if board.get_turn() == "X" else -1
+        scores.append(list(zip(moves, sign * values[start:end])))
+    return scores
+
+
+def choose_best_moves(boards, playouts=AI_PLAYOUTS, seed=None):
+    return [
+        max(scored, key=lambda item: item[1])[0]
+        for scored in score_moves(boards, playouts, seed)
+    ]
+
+
+class InferenceService(object):
+    """Evaluates the positions of concurrent requests together.
+
+    The first request waits up to `window` seconds for others to arrive, then all of
+    them are scored at once and each request gets its own move back.
+    """
+
+    def __init__(self, window=AI_BATCH_WINDOW, max_batch=AI_MAX_BATCH):
+        self._window = window
+        self._max_batch = max_batch
+        self._queue = Queue()
+        self._thread = None
+        self._lock = Lock()
+
+    def submit(self, board):
+        # Positions without moves fail on their own instead of failing their batch.
+        future = Future()
+        if not board.get_legal_moves():
+            future.set_exception(ValueError("The position has no legal moves."))
+            return future
+        self._start()
+        self._queue.put((board, future))
+        return future
+
+    def choose_best_move(self, board, timeout=AI_TIMEOUT):
+        return self.submit(board).result(timeout)
+
+    def _start(self):
+        # Started on the first request so forked web workers each get their own.
+        with self._lock:
+            if self._thread is None:
+                self._thread = Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = monotonic() + self._window
+        while len(batch) < self._max_batch:
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                moves = choose_best_moves([board for board, unused_future in batch])
+            except Exception as exc:
+                for unused_board, future in batch:
+                    future.set_exception(exc)
+            else:
+                for (unused_board, future), move in zip(batch, moves):
+                    future.set_result(move)
+
+
+def enable_inference_service():
+    # Only the web app batches requests; scripts score each move alone, so seeded
+    # runs (e.g. arena.py) are reproducible and don't wait for the batch window.
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = InferenceService()
+    return _service
+
+
+def get_inference_service():
+    # Returns None unless enable_inference_service was called.
+    return _service
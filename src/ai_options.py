@@ -2,14 +2,21 @@
 
 Author: Caio Batista de Melo
 Date Created: 2020-12-28
-Date Modified: 2020-12-28
+Date Modified: 2026-10-19
 Description: Defines the different types of AI available.
 """
 
-from random import choice
+from os import getenv
+from random import choice, getrandbits
 
 from bigboard import BigBoard
 
+# Optional opening book (see opening_book.py) used by every AI for the first plies.
+OPENING_BOOK = getenv("OPENING_BOOK", None)
+OPENING_BOOK_PLIES = int(getenv("OPENING_BOOK_PLIES", 8))
+
+_book = None
+
 
 class Random:
     def choose_best_move(board):
@@ -20,6 +27,42 @@ class Random:
         return row, col, x, y
 
 
+class Playouts:
+    def choose_best_move(board):
+        # Imported lazily so numpy is only needed when this AI is used.
+        from ai_inference import choose_best_moves, get_inference_service
+        from ponder import get_pondered_move
+
+        # Positions searched during the opponent's turn are answered right away.
+        move = get_pondered_move(board)
+        if move is not None:
+            return move
+        service = get_inference_service()
+        if service is not None:
+            return service.choose_best_move(board)
+        # Seeded from random, so random.seed makes the games reproducible.
+        return choose_best_moves([board], seed=getrandbits(32))[0]
+
+
+# Strategies that can be selected through the ai_mode.
+AI_OPTIONS = {"random": Random, "playouts": Playouts}
+
+
+def get_opening_book():
+    # Loaded lazily so numpy is only needed when a book is configured.
+    global _book
+    if _book is None and OPENING_BOOK is not None:
+        from opening_book import OpeningBook
+
+        _book = OpeningBook(OPENING_BOOK, OPENING_BOOK_PLIES)
+    return _book
+
+
 def choose_move(board, ai):
     assert isinstance(board, BigBoard)
-    return Random.choose_best_move(board)
+    book = get_opening_book()
+    if book is not None:
+        move = book.choose_best_move(board)
+        if move is not None:
+            return move
+    return AI_OPTIONS.get(ai, Random).choose_best_move(board)
@@ -0,0 +1,165 @@
+"""analysis.py
+
+Author: Caio Batista de Melo
+Date Created: 2026-10-19
+Date Modified: 2026-10-19
+Description: Evaluates the moves of a finished (or ongoing) game in background jobs.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from os import getenv
+from threading import RLock
+
+from batch_playout import BatchPlayout
+from bigboard import BigBoard
+from cachelib import SimpleCache
+
+# Number of random playouts used to estimate the value of each position.
+ANALYSIS_PLAYOUTS = int(getenv("ANALYSIS_PLAYOUTS", 64))
+ANALYSIS_WORKERS = int(getenv("ANALYSIS_WORKERS", 1))
+# Seconds to wait before retrying an analysis that failed.
+ANALYSIS_RETRY = int(getenv("ANALYSIS_RETRY", 300))
+
+# Maps "<game id>/<move count>" to the analysis of the first <move count> moves, and
+# "<game id>" to the largest move count analyzed so far for that game. Failed analyses
+# are kept as "failed/<game id>/<move count>" for ANALYSIS_RETRY seconds.
+_results = SimpleCache(threshold=1000, default_timeout=0)
+_pending = {}
+_lock = RLock()
+_pool = None
+
+
+def _same_move(a, b, choosing):
+    return a[:2] == b[:2] if choosing else a == b
+
+
+def analyze_moves(start, moves, first=0, playouts=ANALYSIS_PLAYOUTS):
+    """Returns the analysis of moves[first:] of a game that started with `start`.
+
+    Each entry has the value of the position before and after the move and the best
+    alternative, all estimated with random playouts from the point of view of the
+    player who made the move (1 is a sure win and -1 a sure loss).
+    """
+    board = BigBoard()
+    board._turn = start
+    for move in moves[:first]:
+        board.make_move(*move)
+
+    # Collects every position to evaluate so they can be played out in one batch.
+    plies = []
+    positions = []
+    for move in moves[first:]:
+        candidates = board.get_legal_moves()
+        plies.append((board.get_turn(), board.is_choosing(), move, candidates))
+        positions.append(board)
+        for candidate in candidates:
+            after = board.copy()
+            after.make_move(*candidate)
+            positions.append(after)
+        board = board.copy()
+        board.make_move(*move)
+
+    batch = BatchPlayout.from_boards(positions, playouts)
+    batch.run()
+    winners = batch.get_winners()
+
+    def value(index, player):
+        first, last = index * playouts, (index + 1) * playouts
+        results = winners[first:last]
+        score = sum(1 if w == player else (0 if w is None else -1) for w in results)
+        return score / playouts
+
+    analysis = []
+    index = 0
+    for player, choosing, move, candidates in plies:
+        before = value(index, player)
+        values = [value(index + 1 + i, player) for i in range(len(candidates))]
+        best = max(range(len(candidates)), key=values.__getitem__)
+        played = next(
+            i for i, c in enumerate(candidates) if _same_move(c, tuple(move), choosing)
+        )
+        analysis.append(
+            {
+                "before": before,
+                "after": values[played],
+                "best": candidates[best],
+                "best_value": values[best],
+            }
+        )
+        index += 1 + len(candidates)
+
+    return analysis
+
+
+def _get_pool():
+    # Created lazily so forked web workers don't inherit a running pool. The web
+    # workers run threads (inference, pondering), which a forked child could inherit
+    # mid-lock, so the jobs run in processes started by a forkserver instead.
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=ANALYSIS_WORKERS, mp_context=get_context("forkserver")
+        )
+    return _pool
+
+
+def _submit(*args):
+    # Replaces a pool that broke before any of its jobs could report it.
+    global _pool
+    pool = _get_pool()
+    try:
+        return pool, pool.submit(analyze_moves, *args)
+    except BrokenProcessPool:
+        _pool = None
+        pool = _get_pool()
+        return pool, pool.submit(analyze_moves, *args)
+
+
+def get_analysis(game_id, history):
+    """Returns the cached analysis of a game, or None while it's being computed.
+
+    Cache misses schedule a background job that only analyzes the moves that were
+    played since the last analysis of the same game. If that job failed in the last
+    ANALYSIS_RETRY seconds, returns False instead of scheduling it again.
+    """
+    count = len(history)
+    if not count:
+        return []
+
+    key = "{}/{}".format(game_id, count)
+    analysis = _results.get(key)
+    if analysis is not None:
+        return analysis
+    if _results.has("failed/" + key):
+        return False
+
+    with _lock:
+        if key not in _pending:
+            first = _results.get(game_id) or 0
+            previous = _results.get("{}/{}".format(game_id, first)) if first else []
+            if first > count or previous is None:
+                first, previous = 0, []
+
+            moves = [m[1:5] for m in history]
+
+            def store(job):
+                global _pool
+                with _lock:
+                    error = job.exception()
+                    if error is None:
+                        _results.set(key, previous + job.result())
+                        _results.set(game_id, max(count, _results.get(game_id) or 0))
+                    else:
+                        _results.set("failed/" + key, True, timeout=ANALYSIS_RETRY)
+                        # A dead worker breaks the pool for good, so start a new one.
+                        if isinstance(error, BrokenProcessPool) and _pool is pool:
+                            _pool = None
+                    del _pending[key]
+
+            pool, job = _submit(history[0][0], moves, first)
+            _pending[key] = job
+            job.add_done_callback(store)
+
+    return None
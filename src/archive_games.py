@@ -0,0 +1,131 @@
+"""archive_games.py
+
+Author: Caio Batista de Melo
+Date Created: 2026-10-19
+Date Modified: 2026-10-19
+Description: Moves finished and idle online games to a compact archive table.
+"""
+
+import argparse
+from datetime import datetime, timedelta
+
+from bigboard import BigBoard
+from encoding import encode_history
+
+# Rows per fetch from the hot table and per INSERT when moving them.
+ARCHIVE_BATCH = 500
+
+
+def find_games_to_archive(query, idle_before):
+    # Streams the hot table and keeps only the compact rows for the games to archive,
+    # along with the board that was read (to detect moves made in the meantime).
+    archived = datetime.utcnow().isoformat()
+    for game in query.yield_per(ARCHIVE_BATCH):
+        board = BigBoard.from_json(game.board)
+        last_move = game.last_move or game.timestamp or ""
+        if board.is_over() or last_move < idle_before:
+            history = board.get_move_history()
+            yield game.board, {
+                "id": game.id,
+                "timestamp": game.timestamp,
+                "archived": archived,
+                "xPASS": game.xPASS,
+                "oPASS": game.oPASS,
+                "start": history[0][0] if history else board.get_turn(),
+                "winner": board.check_winner(),
+                "moves": encode_history(history),
+            }
+
+
+def archive_games(db, hot, cold, idle_days):
+    """Moves the finished games and the ones without moves in idle_days to the archive.
+
+    Each archived game leaves an id-only stub in the hot table, so its id is never
+    given to a new game. Returns the ids of the archived games and of the ones that
+    were skipped because the archive already had a game with the same id.
+    """
+    idle_before = (datetime.utcnow() - timedelta(days=idle_days)).isoformat()
+    query = (
+        hot.query.with_entities(
+            hot.id, hot.timestamp, hot.last_move, hot.xPASS, hot.oPASS, hot.board
+        )
+        .filter(hot.board.isnot(None))
+        .order_by(hot.id)
+    )
+    # Read everything before writing: the server-side cursor holds the connection.
+    rows = list(find_games_to_archive(query, idle_before))
+
+    archived, conflicts = [], []
+    for start in range(0, len(rows), ARCHIVE_BATCH):
+        end = start + ARCHIVE_BATCH
+        chunk = rows[start:end]
+        ids = [row["id"] for unused_board, row in chunk]
+        taken = {
+            game.id
+            for game in cold.query.with_entities(cold.id).filter(cold.id.in_(ids))
+        }
+
+        moved = []
+        for board, row in chunk:
+            if row["id"] in taken:
+                conflicts.append(row["id"])
+                continue
+            # Only games that weren't played since they were read become stubs.
+            stub = (
+                hot.__table__.update()
+                .where(hot.id == row["id"])
+                .where(hot.board == board)
+                .values(
+                    timestamp=None, last_move=None, xPASS=None, oPASS=None, board=None
+                )
+            )
+            if db.session.execute(stub).rowcount:
+                moved.append(row)
+
+        if moved:
+            db.session.execute(cold.__table__.insert().values(moved))
+        db.session.commit()
+        archived.extend(row["id"] for row in moved)
+
+    return archived, conflicts
+
+
+def restore_game(db, archived, hot):
+    # Moves an archived game back into its stub in the hot table so it can be played.
+    game = hot.query.filter_by(id=archived.id).first()
+    if game is None:
+        game = hot(timestamp=archived.timestamp, xPASS=None, oPASS=None, board=None)
+        game.id = archived.id
+        db.session.add(game)
+    assert game.board is None, "Game #{} exists in both tables!".format(archived.id)
+
+    game.timestamp = archived.timestamp
+    game.last_move = datetime.utcnow().isoformat()
+    game.xPASS = archived.xPASS
+    game.oPASS = archived.oPASS
+    game.board = archived.to_board().to_json()
+    db.session.delete(archived)
+    db.session.commit()
+    return game
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="This script archives finished and idle online games."
+    )
+    parser.add_argument(
+        "-d",
+        "--idle-days",
+        help="archive unfinished games without moves in this many days",
+        default=30,
+        type=int,
+    )
+    args = parser.parse_args()
+
+    from game import ArchivedGame, OnlineGame, create_app, db
+
+    with create_app().app_context():
+        ids, conflicts = archive_games(db, OnlineGame, ArchivedGame, args.idle_days)
+        print(f"Archived {len(ids)} games.")
+        if conflicts:
+            print(f"Skipped {len(conflicts)} games already in the archive: {conflicts}")
@@ -0,0 +1,154 @@
+"""arena.py
+
+Author: Caio Batista de Melo
+Date Created: 2026-10-19
+Date Modified: 2026-10-19
+Description: Plays round-robin matches between the AI options and rates them.
+"""
+
+import argparse
+import random
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import combinations
+from json import dumps
+from time import perf_counter
+
+from ai_options import AI_OPTIONS, choose_move
+from bigboard import BigBoard
+
+ELO_START = 1500
+ELO_K = 16
+
+
+def play_game(job):
+    # Plays a single seeded game; returns the winning strategy (None for a draw) and
+    # the time each strategy took to decide its moves.
+    x_ai, o_ai, seed = job
+    random.seed(seed)
+    strategies = {"X": x_ai, "O": o_ai}
+    latencies = {x_ai: [], o_ai: []}
+
+    board = BigBoard(turn="X")
+    while not board.is_over():
+        ai = strategies[board.get_turn()]
+        start = perf_counter()
+        move = choose_move(board, ai)
+        latencies[ai].append(perf_counter() - start)
+        board.make_move(*move)
+
+    winner = board.check_winner()
+    return x_ai, o_ai, (strategies[winner] if winner else None), latencies
+
+
+def schedule(strategies, rounds, seed):
+    # Every pair plays `rounds` games, alternating which side moves first.
+    pairs = list(combinations(strategies, 2)) or [(s, s) for s in strategies]
+    jobs = []
+    for a, b in pairs:
+        for i in range(rounds):
+            x_ai, o_ai = (a, b) if i % 2 == 0 else (b, a)
+            jobs.append((x_ai, o_ai, seed + len(jobs)))
+    return jobs
+
+
+def expected_score(rating, other):
+    return 1 / (1 + 10 ** ((other - rating) / 400))
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def summarize(strategies, results):
+    ratings = {s: ELO_START for s in strategies}
+    records = {s: {"win": 0, "draw": 0, "loss": 0} for s in strategies}
+    latencies = {s: [] for s in strategies}
+
+    # Results come back in schedule order, so the ratings are reproducible.
+    for x_ai, o_ai, winner, times in results:
+        for ai, values in times.items():
+            latencies[ai].extend(values)
+        if x_ai == o_ai:
+            continue
+
+        score = 0.5 if winner is None else float(winner == x_ai)
+        change = ELO_K * (score - expected_score(ratings[x_ai], ratings[o_ai]))
+        ratings[x_ai] += change
+        ratings[o_ai] -= change
+
+        if winner is None:
+            records[x_ai]["draw"] += 1
+            records[o_ai]["draw"] += 1
+        else:
+            loser = o_ai if winner == x_ai else x_ai
+            records[winner]["win"] += 1
+            records[loser]["loss"] += 1
+
+    return {
+        s: {
+            "elo": round(ratings[s], 1),
+            **records[s],
+            "moves": len(latencies[s]),
+            "p50_ms": round(1000 * (percentile(latencies[s], 50) or 0), 4),
+            "p99_ms": round(1000 * (percentile(latencies[s], 99) or 0), 4),
+        }
+        for s in strategies
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="This script plays the AI options against each other."
+    )
+    parser.add_argument(
+        "-a",
+        "--ai",
+        help="AI options to include (defaults to all of them)",
+        nargs="+",
+        choices=sorted(AI_OPTIONS),
+        default=sorted(AI_OPTIONS),
+    )
+    parser.add_argument(
+        "-r", "--rounds", help="games played by each pair", default=100, type=int
+    )
+    parser.add_argument(
+        "-j", "--jobs", help="number of worker processes", default=None, type=int
+    )
+    parser.add_argument(
+        "-s", "--seed", help="seed of the first game", default=0, type=int
+    )
+    parser.add_argument(
+        "-o",
+        "--out",
+        help="file to append the results to (one JSON object per run)",
+        nargs="?",
+        type=argparse.FileType("a"),
+        default=None,
+    )
+    args = parser.parse_args()
+
+    jobs = schedule(args.ai, args.rounds, args.seed)
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        results = list(pool.map(play_game, jobs, chunksize=max(1, len(jobs) // 64)))
+    summary = summarize(args.ai, results)
+
+    print(f"{'AI':<12}{'Elo':>8}{'W':>6}{'D':>6}{'L':>6}{'p50 ms':>10}{'p99 ms':>10}")
+    for ai, row in sorted(summary.items(), key=lambda item: -item[1]["elo"]):
+        print(
+            f"{ai:<12}{row['elo']:>8.1f}{row['win']:>6}{row['draw']:>6}{row['loss']:>6}"
+            f"{row['p50_ms']:>10.3f}{row['p99_ms']:>10.3f}"
+        )
+
+    if args.out is not None:
+        run = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "rounds": args.rounds,
+            "seed": args.seed,
+            "results": summary,
+        }
+        args.out.write(dumps(run) + "\n")
+        args.out.close()
@@ -0,0 +1,181 @@
+"""batch_playout.py
+
+Author: Caio Batista de Melo
+Date Created: 2026-10-19
+Date Modified: 2026-10-19
+Description: Plays thousands of random games at once using NumPy arrays.
+"""
+
+from itertools import chain
+
+import numpy as np
+
+PLAYERS = ("X", "O")
+
+# Cells and small-board winners use 0 for empty/undecided, 1 for "X" and 2 for "O".
+CODES = {None: 0, "X": 1, "O": 2}
+# Both boards and cells are indexed as 3 * row + col, like BigBoard's valid moves.
+LINES = np.array(
+    [
+        [0, 1, 2],  # rows
+        [3, 4, 5],
+        [6, 7, 8],
+        [0, 3, 6],  # columns
+        [1, 4, 7],
+        [2, 5, 8],
+        [0, 4, 8],  # main diagonal
+        [2, 4, 6],  # reverse diagonal
+    ]
+)
+
+# Every placement can be followed by at most one board choice.
+MAX_PLIES = 2 * 81
+
+
+def _masked_choice(rng, mask):
+    # Picks a uniformly random True column for each row of the mask.
+    keys = rng.random(mask.shape)
+    keys[~mask] = -1
+    return keys.argmax(axis=1)
+
+
+class BatchPlayout(object):
+    def __init__(self, n, seed=None):
+        self._rng = np.random.default_rng(seed)
+        self._cells = np.zeros((n, 9, 9), dtype=np.int8)
+        self._small_winners = np.zeros((n, 9), dtype=np.int8)
+        self._small_over = np.zeros((n, 9), dtype=bool)
+        # Board the next move must be played on, or -1 if any open board is allowed.
+        self._forced = np.full(n, -1, dtype=np.int64)
+        self._turn = self._rng.integers(1, 3, size=n).astype(np.int8)
+        self._choosing = np.zeros(n, dtype=bool)
+        self._winners = np.zeros(n, dtype=np.int8)
+        # Each ply stores (turn, board, cell, choosing).
+        self._history = np.zeros((n, MAX_PLIES, 4), dtype=np.int8)
+        self._lengths = np.zeros(n, dtype=np.int64)
+        # Indices of the games that are still being played.
+        self._active = np.arange(n)
+
+    @classmethod
+    def from_boards(cls, boards, playouts=1, seed=None):
+        # Continues each BigBoard position with `playouts` independent random games;
+        # games [i * playouts, (i + 1) * playouts) are the playouts of boards[i].
+        batch = cls(len(boards) * playouts, seed)
+        finished = np.zeros(len(boards) * playouts, dtype=bool)
+
+        for i, board in enumerate(boards):
+            games = slice(i * playouts, (i + 1) * playouts)
+            smalls = list(chain.from_iterable(board.get_board()))
+            batch._cells[games] = [
+                [CODES[v] for v in chain.from_iterable(small.get_board())]
+                for small in smalls
+            ]
+            batch._small_winners[games] = [CODES[s.check_winner()] for s in smalls]
+            batch._small_over[games] = [s.is_over() for s in smalls]
+
+            valid = board.get_valid_moves()
+            batch._forced[games] = int(next(iter(valid))) if len(valid) == 1 else -1
+            batch._turn[games] = CODES[board.get_turn()]
+            batch._choosing[games] = board.is_choosing()
+            batch._winners[games] = CODES[board.check_winner()]
+            finished[games] = board.is_over()
+
+        batch._active = np.flatnonzero(~finished)
+        return batch
+
+    def step(self):
+        # Advances every active game by one ply; returns whether any game is left.
+        games = self._active
+        if not len(games):
+            return False
+
+        turn = self._turn[games]
+        choosing = self._choosing[games]
+        forced = self._forced[games]
+
+        # Boards that can be played on (or chosen) in each game.
+        legal = ~self._small_over[games]
+        pinned = np.flatnonzero(forced >= 0)
+        legal[pinned] = False
+        legal[pinned, forced[pinned]] = True
+
+        # Same distribution as ai_options.Random: a random board, then a random cell.
+        board = _masked_choice(self._rng, legal)
+        cell = _masked_choice(self._rng, self._cells[games, board] == 0)
+
+        ply = self._lengths[games]
+        self._history[games, ply] = np.stack((turn, board, cell, choosing), axis=1)
+        self._lengths[games] += 1
+
+        # Choosing a board pins the opponent to it and passes the turn.
+        next_turn = 3 - turn
+        next_choosing = np.zeros(len(games), dtype=bool)
+        next_forced = board.copy()
+        finished = np.zeros(len(games), dtype=bool)
+
+        placing = np.flatnonzero(~choosing)
+        g, b, c, t = games[placing], board[placing], cell[placing], turn[placing]
+        self._cells[g, b, c] = t
+
+        # Only the player who just moved can have completed a line.
+        small = self._cells[g, b]
+        small_won = (small[:, LINES] == t[:, None, None]).all(axis=-1).any(axis=-1)
+        self._small_winners[g[small_won], b[small_won]] = t[small_won]
+        self._small_over[g, b] = small_won | (small != 0).all(axis=-1)
+
+        winners = self._small_winners[g]
+        big_won = (winners[:, LINES] == t[:, None, None]).all(axis=-1).any(axis=-1)
+        all_over = self._small_over[g].all(axis=-1)
+        x_wins = (winners == 1).sum(axis=-1)
+        o_wins = (winners == 2).sum(axis=-1)
+        majority = np.where(x_wins > o_wins, 1, np.where(o_wins > x_wins, 2, 0))
+        over = big_won | all_over
+        self._winners[g] = np.where(big_won, t, np.where(all_over, majority, 0))
+        finished[placing] = over
+
+        # Sending the opponent to a finished board frees the move, unless the mover
+        # has won that board; then the mover chooses the next board instead.
+        target_over = self._small_over[g, c]
+        mover_chooses = target_over & (self._small_winners[g, c] == t) & ~over
+        next_choosing[placing] = mover_chooses
+        next_forced[placing] = np.where(target_over, -1, c)
+        next_turn[placing] = np.where(mover_chooses, t, 3 - t)
+
+        self._turn[games] = next_turn
+        self._choosing[games] = next_choosing
+        self._forced[games] = next_forced
+
+        # Retire finished games so later steps only touch the ones still running.
+        self._active = games[~finished]
+        return len(self._active) > 0
+
+    def run(self):
+        while self.step():
+            pass
+
+    def is_over(self):
+        return not len(self._active)
+
+    def get_move_histories(self):
+        # Same tuple format as BigBoard.get_move_history.
+        return [
+            [
+                (PLAYERS[t - 1], b // 3, b % 3, c // 3, c % 3, bool(choosing))
+                for (t, b, c, choosing) in moves[:length]
+            ]
+            for moves, length in zip(self._history.tolist(), self._lengths.tolist())
+        ]
+
+    def get_winners(self):
+        return [PLAYERS[w - 1] if w else None for w in self._winners.tolist()]
+
+    def get_values(self, playouts):
+        # Mean result for "X" (1 win, 0 draw, -1 loss) of each group of playouts.
+        results = np.select([self._winners == 1, self._winners == 2], [1.0, -1.0])
+        return results.reshape(-1, playouts).mean(axis=1)
+
+
+def play_random_games(n, seed=None):
+    batch = BatchPlayout(n, seed)
+    batch.run()
+    return batch.get_move_histories(), batch.get_winners()
@@ -2,24 +2,26 @@
 
 Author: Caio Batista de Melo
 Date Created: 2020-11-06
-Date Modified: 2020-11-08
+Date Modified: 2026-10-19
 Description: Implements the logic for the Tic-Tac-Ception game and a basic terminal interface.
 """
 
 from itertools import chain
 from random import randint
 
-from jsonpickle import decode, encode
 from smallboard import SmallBoard
 
 
 class BigBoard(object):
-    def __init__(self):
+    def __init__(self, turn=None):
         self._board = [[SmallBoard() for _ in range(3)] for _ in range(3)]
         self._winner = None
         self._history = []
         self._players = ("X", "O")
-        self._turn = self._players[1] if randint(0, 1) else self._players[0]
+        if turn is None:
+            turn = self._players[1] if randint(0, 1) else self._players[0]
+        assert turn in self._players
+        self._turn = turn
         self._possible_moves = {
             str(3 * i + j): self._board[i][j].get_empty()
             for i in range(len(self._board))
@@ -135,8 +137,36 @@ class BigBoard(object):
     def get_valid_moves(self):
         return self._possible_moves
 
+    def get_legal_moves(self):
+        # Lists the arguments for make_move; when choosing a board, the cell doesn't
+        # matter, so each board is listed once with its first open cell.
+        if self._choosing_board:
+            return [
+                (int(small) // 3, int(small) % 3, *cells[0])
+                for small, cells in self._possible_moves.items()
+            ]
+        return [
+            (int(small) // 3, int(small) % 3, x, y)
+            for small, cells in self._possible_moves.items()
+            for (x, y) in cells
+        ]
+
+    def copy(self):
+        # Much faster than deepcopy, for tools that explore many positions.
+        board = BigBoard.__new__(BigBoard)
+        board.__dict__.update(self.__dict__)
+        board._board = [[small.copy() for small in row] for row in self._board]
+        board._history = list(self._history)
+        board._possible_moves = dict(self._possible_moves)
+        return board
+
+    # jsonpickle is only imported by the web app, so the engine stays dependency-free.
     def to_json(self):
+        from jsonpickle import encode
+
         return encode(self)
 
     def from_json(json):
+        from jsonpickle import decode
+
         return decode(json)
@@ -0,0 +1,58 @@
+"""board_render.py
+
+Author: Caio Batista de Melo
+Date Created: 2026-10-19
+Date Modified: 2026-10-19
+Description: Renders the 81-cell board from cached small-board HTML fragments.
+"""
+
+from functools import lru_cache
+from itertools import chain
+
+from flask import render_template
+from markupsafe import Markup
+
+# Fragments are cached per position, cells, endpoint, turn and flags, so the same
+# cells are cached once for each of the nine positions. A fragment is ~1.5 KB, and
+# 4096 of them (~6 MB per worker) keep the boards of many concurrent games warm.
+FRAGMENT_CACHE_SIZE = 2**12
+
+
+@lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def render_small_board(endpoint, x, y, cells, winner, turn, playable, choosable):
+    # The HTML for a small board is fully determined by these arguments.
+    return render_template(
+        "small-board.html",
+        endpoint=endpoint,
+        x=x,
+        y=y,
+        cells=cells,
+        winner=winner,
+        turn=turn,
+        playable=playable,
+        choosable=choosable,
+    )
+
+
+def render_board(board, endpoint=None, turn=None, valid=(), choice=False):
+    # Builds the rows of the big board out of the nine (cached) small-board fragments.
+    rows = []
+    for x in range(3):
+        fragments = []
+        for y in range(3):
+            small = board[x][y]
+            open_board = endpoint is not None and str(3 * x + y) in valid
+            fragments.append(
+                render_small_board(
+                    endpoint,
+                    x,
+                    y,
+                    tuple(chain.from_iterable(small.get_board())),
+                    small.check_winner(),
+                    turn if open_board and not choice else None,
+                    open_board and not choice,
+                    open_board and choice,
+                )
+            )
+        rows.append("<tr>{}</tr>".format("".join(fragments)))
+    return Markup("".join(rows))
@@ -0,0 +1,171 @@
+"""bulk_games.py
+
+Author: Caio Batista de Melo
+Date Created: 2026-10-19
+Date Modified: 2026-10-19
+Description: Imports and exports online games in bulk.
+"""
+
+import argparse
+from datetime import datetime
+from heapq import merge
+from itertools import islice
+from json import dumps, load
+from operator import itemgetter
+
+from bigboard import BigBoard
+from encoding import decode_move_history
+
+# Rows per multi-row INSERT and per fetch from the server-side cursor.
+IMPORT_BATCH = 500
+EXPORT_BATCH = 1000
+
+
+def replay_game(data):
+    # Replays a saved game ({"start", "moves"}) and fails on the first invalid move.
+    board = BigBoard(turn=data["start"])
+    for i, move in enumerate(data["moves"]):
+        big_row, big_col, sm_row, sm_col = move
+        played = len(board.get_move_history())
+        board.make_move(big_row, big_col, sm_row, sm_col)
+        if len(board.get_move_history()) == played:
+            raise ValueError("Invalid move #{}: {}".format(i + 1, move))
+    return board
+
+
+def read_games(paths):
+    # Opens one game file at a time, so thousands of files don't exhaust descriptors.
+    for path in paths:
+        with open(path) as f:
+            yield load(f)
+
+
+def import_games(db, table, games, xPASS, oPASS):
+    """Validates and inserts the games; returns the ids of the new rows.
+
+    games can be any iterable; it's consumed IMPORT_BATCH games at a time, and
+    nothing is committed unless every game is valid. xPASS and oPASS should already
+    be hashed; every imported game shares them.
+    """
+    timestamp = datetime.utcnow().isoformat()
+    # The ids of a multi-row INSERT are spaced by MySQL's auto_increment_increment
+    # (1 elsewhere); SQLite reports the last one as lastrowid and MySQL the first.
+    dialect = db.session.get_bind().dialect.name
+    reports_last = dialect == "sqlite"
+    step = 1
+    if dialect == "mysql":
+        step = db.session.execute("SELECT @@auto_increment_increment").scalar()
+    games = iter(games)
+    ids = []
+    while True:
+        chunk = [
+            {
+                "timestamp": timestamp,
+                "last_move": timestamp,
+                "xPASS": xPASS,
+                "oPASS": oPASS,
+                "board": replay_game(data).to_json(),
+            }
+            for data in islice(games, IMPORT_BATCH)
+        ]
+        if not chunk:
+            break
+        result = db.session.execute(table.insert().values(chunk))
+        first = result.lastrowid - (step * (len(chunk) - 1) if reports_last else 0)
+        ids.extend(range(first, first + step * len(chunk), step))
+    db.session.commit()
+
+    return ids
+
+
+def _export_hot(query):
+    for game in query.yield_per(EXPORT_BATCH):
+        moves = BigBoard.from_json(game.board).get_move_history()
+        yield game.id, game.timestamp, moves[0][0] if moves else None, moves
+
+
+def _export_archived(query):
+    # Archived games are decoded straight from their bytes, without a BigBoard.
+    for game in query.yield_per(EXPORT_BATCH):
+        moves = decode_move_history(game.start, game.moves)
+        yield game.id, game.timestamp, game.start if moves else None, moves
+
+
+def export_games(query, archived_query=None):
+    """Yields one JSON line per game, streaming the rows from server-side cursors.
+
+    query reads (id, timestamp, board) from the online games and archived_query, if
+    given, (id, timestamp, start, moves) from the archived ones; both must be sorted
+    by id, and the games of both are exported in id order.
+    """
+    games = _export_hot(query)
+    if archived_query is not None:
+        games = merge(games, _export_archived(archived_query), key=itemgetter(0))
+    for game_id, timestamp, start, moves in games:
+        export = {
+            "id": game_id,
+            "timestamp": timestamp,
+            "start": start,
+            "moves": [
+                (b_r, b_c, s_r, s_c)
+                for (unused_turn, b_r, b_c, s_r, s_c, unused_choice) in moves
+            ],
+        }
+        yield dumps(export) + "\n"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="This script imports and exports online games in bulk."
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    importer = subparsers.add_parser("import", help="import saved game files")
+    importer.add_argument(
+        "files_in", help="game files exported by save-game", nargs="+"
+    )
+    importer.add_argument("-x", "--xPASS", help="password for player X", required=True)
+    importer.add_argument("-o", "--oPASS", help="password for player O", required=True)
+
+    exporter = subparsers.add_parser("export", help="export games as JSON lines")
+    exporter.add_argument(
+        "-o",
+        "--out",
+        help="filename to export the games",
+        type=argparse.FileType("w"),
+        required=True,
+    )
+    args = parser.parse_args()
+
+    from game import ArchivedGame, OnlineGame, bcrypt, create_app, db
+
+    with create_app().app_context():
+        if args.command == "import":
+            ids = import_games(
+                db,
+                OnlineGame.__table__,
+                read_games(args.files_in),
+                bcrypt.generate_password_hash(args.xPASS).decode("utf8"),
+                bcrypt.generate_password_hash(args.oPASS).decode("utf8"),
+            )
+            if ids:
+                print(f"Imported {len(ids)} games (IDs #{ids[0]} to #{ids[-1]})")
+
+        else:
+            query = (
+                OnlineGame.query.with_entities(
+                    OnlineGame.id, OnlineGame.timestamp, OnlineGame.board
+                )
+                .filter(OnlineGame.board.isnot(None))
+                .order_by(OnlineGame.id)
+            )
+            archived_query = ArchivedGame.query.with_entities(
+                ArchivedGame.id,
+                ArchivedGame.timestamp,
+                ArchivedGame.start,
+                ArchivedGame.moves,
+            ).order_by(ArchivedGame.id)
+            for line in export_games(query, archived_query):
+                args.out.write(line)
+            args.out.close()
@@ -2,14 +2,15 @@
 
 Author: Caio Batista de Melo
 Date Created: 2021-01-30
-Date Modified: 2021-01-30
+Date Modified: 2026-10-19
 Description: Manages DB migrations.
 """
 
 from flask_migrate import Migrate, MigrateCommand
 from flask_script import Manager
-from game import app, db
+from game import create_app, db
 
+app = create_app()
 migrate = Migrate(app, db)
 manager = Manager(app)
 manager.add_command("db", MigrateCommand)
@@ -0,0 +1,126 @@
+"""encoding.py
+
+Author: Caio Batista de Melo
+Date Created: 2026-10-19
+Date Modified: 2026-10-19
+Description: Compact encodings for moves and positions of a BigBoard.
+"""
+
+from hashlib import blake2b
+from itertools import chain
+
+CODES = {None: 0, "X": 1, "O": 2}
+
+# Placing on cell (s_row, s_col) of board (b_row, b_col) is 9 * board + cell, and
+# choosing board (b_row, b_col) for the opponent is CHOICE_OFFSET + board.
+CHOICE_OFFSET = 81
+
+# Cells of each row, column and diagonal of a small board, indexed as 3 * row + col.
+LINES = (
+    (0, 1, 2),
+    (3, 4, 5),
+    (6, 7, 8),
+    (0, 3, 6),
+    (1, 4, 7),
+    (2, 5, 8),
+    (0, 4, 8),
+    (2, 4, 6),
+)
+# Only the lines through the cell that was just played can have been completed.
+CELL_LINES = tuple(tuple(line for line in LINES if cell in line) for cell in range(9))
+
+
+def encode_move(b_row, b_col, s_row, s_col, choosing=False):
+    board = 3 * b_row + b_col
+    if choosing:
+        return CHOICE_OFFSET + board
+    return 9 * board + 3 * s_row + s_col
+
+
+def decode_move(code):
+    # Returns (b_row, b_col, s_row, s_col, choosing); choices don't carry a cell.
+    if code >= CHOICE_OFFSET:
+        board = code - CHOICE_OFFSET
+        return board // 3, board % 3, None, None, True
+    board, cell = divmod(code, 9)
+    return board // 3, board % 3, cell // 3, cell % 3, False
+
+
+def move_to_play(board, code):
+    # Converts a code into the arguments for BigBoard.make_move; for a board choice,
+    # the cell is irrelevant so it uses the same one the play route would.
+    b_row, b_col, s_row, s_col, choosing = decode_move(code)
+    if choosing:
+        s_row, s_col = board.get_valid_moves()[str(3 * b_row + b_col)][0]
+    return b_row, b_col, s_row, s_col
+
+
+def encode_history(history):
+    # One byte per move of a BigBoard.get_move_history().
+    return bytes(
+        encode_move(b_r, b_c, s_r, s_c, choice)
+        for (unused_turn, b_r, b_c, s_r, s_c, choice) in history
+    )
+
+
+def decode_history(board, data):
+    # Replays encoded moves on a board that is set up with the right starting turn.
+    for code in data:
+        board.make_move(*move_to_play(board, code))
+    return board
+
+
+def decode_move_history(start, data):
+    """Returns the BigBoard.get_move_history() of encoded moves without a BigBoard.
+
+    Only tracks what the history needs (cells, small-board results, turn and the
+    choosing flag), so it's much faster than replaying the moves with
+    decode_history. Board choices get the first open cell, like move_to_play.
+    """
+    cells = [[None] * 9 for _ in range(9)]
+    finished = [False] * 9
+    winners = [None] * 9
+    turn, choosing = start, False
+    history = []
+    for code in data:
+        b_row, b_col, s_row, s_col, unused_choosing = decode_move(code)
+        board = 3 * b_row + b_col
+        small = cells[board]
+        if choosing:
+            cell = small.index(None)
+            history.append((turn, b_row, b_col, cell // 3, cell % 3, True))
+            choosing = False
+        else:
+            history.append((turn, b_row, b_col, s_row, s_col, False))
+            target = 3 * s_row + s_col
+            small[target] = turn
+            if any(
+                small[a] == small[b] == small[c] == turn
+                for (a, b, c) in CELL_LINES[target]
+            ):
+                winners[board], finished[board] = turn, True
+            elif None not in small:
+                finished[board] = True
+            # Sending the opponent to a board the mover won lets the mover choose.
+            choosing = finished[target] and winners[target] == turn
+        if not choosing:
+            turn = "O" if turn == "X" else "X"
+    return history
+
+
+def position_key(board):
+    # Stable 64-bit key for a position: cells, player to move, choosing flag and the
+    # boards that can be played on (this captures the forced board).
+    cells = (
+        CODES[v]
+        for small in chain.from_iterable(board.get_board())
+        for v in chain.from_iterable(small.get_board())
+    )
+    valid = sum(1 << int(small) for small in board.get_valid_moves())
+    data = bytes(
+        chain(
+            cells,
+            (CODES[board.get_turn()], board.is_choosing(), valid & 0xFF, valid >> 8),
+        )
+    )
+    return int.from_bytes(blake2b(data, digest_size=8).digest(), "little")
@@ -2,16 +2,19 @@
 
 Author: Caio Batista de Melo
 Date Created: 2020-11-06
-Date Modified: 2021-01-30
+Date Modified: 2026-10-19
 Description: Sets up the flask server that allows playing the game.
 """
 
 from datetime import datetime
 from json import dumps, load
 from os import getenv
+from uuid import uuid4
 
 from flask import (
+    Blueprint,
     Flask,
+    Response,
     abort,
     flash,
     make_response,
@@ -19,17 +22,24 @@ from flask import (
     render_template,
     request,
     session,
+    stream_with_context,
     url_for,
 )
 from werkzeug.exceptions import HTTPException
 
-from ai_options import choose_move
+from ai_inference import enable_inference_service
+from ai_options import AI_OPTIONS, choose_move
+from analysis import get_analysis
+from archive_games import restore_game
 from bigboard import BigBoard
+from board_render import render_board
+from bulk_games import export_games, import_games
+from encoding import decode_history
 from flask_bcrypt import Bcrypt
 from flask_sqlalchemy import SQLAlchemy
-from pymysql import install_as_MySQLdb
-
-install_as_MySQLdb()
+from ponder import start_pondering
+from static_assets import get_static_assets
+from view_cache import get_game_state, get_view, init_view_cache, invalidate
 
 
 class ReverseProxied(object):
@@ -41,26 +51,48 @@ class ReverseProxied(object):
         return self.app(environ, start_response)
 
 
-app = Flask(__name__)
-app.secret_key = getenv(
-    "SECRET_KEY",
-    b"\x81^\xaaq\\\x83\x0f4\xf2\x9d\xd7\x08\x12\x0bA\x1a\tVD\x96>\xf3\x180",
-)
-db_config = {
-    "host": getenv("DB_HOST", "localhost"),
-    "port": getenv("DB_PORT", "3306"),
-    "user": getenv("DB_USER", "user"),
-    "passwd": getenv("DB_PASS", "pass"),
-    "database": getenv("DB_NAME", "db"),
-}
-app.config[
-    "SQLALCHEMY_DATABASE_URI"
-] = "mysql://{user}:{passwd}@{host}:{port}/{database}".format(**db_config)
-app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-if getenv("SECRET_KEY", None) is not None:  # Check if developing locally
-    app.wsgi_app = ReverseProxied(app.wsgi_app)
-db = SQLAlchemy(app)
-bcrypt = Bcrypt(app)
+# Extensions are bound to the app in create_app; the DB engine is only created on the
+# first query, so forked workers (gunicorn --preload) don't share connections.
+db = SQLAlchemy()
+bcrypt = Bcrypt()
+main = Blueprint("main", __name__)
+
+
+def create_app(config=None):
+    # The MySQL driver is only needed once there's an app to serve.
+    from pymysql import install_as_MySQLdb
+
+    install_as_MySQLdb()
+
+    # Static files are served from memory by static_assets instead of Flask's route.
+    app = Flask(__name__, static_folder=None)
+    app.secret_key = getenv(
+        "SECRET_KEY",
+        b"\x81^\xaaq\\\x83\x0f4\xf2\x9d\xd7\x08\x12\x0bA\x1a\tVD\x96>\xf3\x180",
+    )
+    db_config = {
+        "host": getenv("DB_HOST", "localhost"),
+        "port": getenv("DB_PORT", "3306"),
+        "user": getenv("DB_USER", "user"),
+        "passwd": getenv("DB_PASS", "pass"),
+        "database": getenv("DB_NAME", "db"),
+    }
+    app.config[
+        "SQLALCHEMY_DATABASE_URI"
+    ] = "mysql://{user}:{passwd}@{host}:{port}/{database}".format(**db_config)
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config.update(config or {})
+    if getenv("SECRET_KEY", None) is not None:  # Check if developing locally
+        app.wsgi_app = ReverseProxied(app.wsgi_app)
+
+    db.init_app(app)
+    bcrypt.init_app(app)
+    get_static_assets().init_app(app)
+    init_view_cache(app)
+    enable_inference_service()
+    app.register_blueprint(main)
+
+    return app
 
 
 class OnlineGame(db.Model):
@@ -70,12 +102,14 @@ class OnlineGame(db.Model):
     timestamp = db.Column(
         db.Text
     )  # Timestamp of game creation (datetime.utcnow().isoformat())
+    last_move = db.Column(db.Text)  # Timestamp of the last move (or of creation)
     xPASS = db.Column(db.Text)  # Hashed password for player X
     oPASS = db.Column(db.Text)  # Hashed password for player O
-    board = db.Column(db.Text)  # Current game board
+    board = db.Column(db.Text)  # Current game board (None once archived)
 
-    def __init__(self, timestamp, xPASS, oPASS, board):
+    def __init__(self, timestamp, xPASS, oPASS, board, last_move=None):
         self.timestamp = timestamp
+        self.last_move = last_move or timestamp
         self.xPASS = xPASS
         self.oPASS = oPASS
         self.board = board
@@ -84,12 +118,108 @@ class OnlineGame(db.Model):
         return "<id {}>".format(self.id)
 
 
-@app.route("/")
+class ArchivedGame(db.Model):
+    __tablename__ = "archived_games"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)  # Game ID
+    timestamp = db.Column(db.Text)  # Timestamp of game creation
+    archived = db.Column(db.Text)  # Timestamp of archival
+    xPASS = db.Column(db.Text)  # Hashed password for player X
+    oPASS = db.Column(db.Text)  # Hashed password for player O
+    start = db.Column(db.String(1))  # Player who made the first move
+    winner = db.Column(db.String(1))  # Winner of the game (if any)
+    moves = db.Column(db.LargeBinary)  # One byte per move (see encoding.py)
+
+    def to_board(self):
+        return decode_history(BigBoard(turn=self.start), self.moves)
+
+    def __repr__(self):
+        return "<archived id {}>".format(self.id)
+
+
+def find_online_game(game_id):
+    # Read-only lookup; archived games leave a stub without a board in the hot table.
+    game = OnlineGame.query.filter(
+        OnlineGame.id == game_id, OnlineGame.board.isnot(None)
+    ).first()
+    if game is None:
+        game = ArchivedGame.query.filter_by(id=game_id).first()
+    return game
+
+
+def get_online_game(game_id):
+    # Archived games are moved back to the hot table when someone plays them.
+    game = find_online_game(game_id)
+    if isinstance(game, ArchivedGame):
+        game = restore_game(db, game, OnlineGame)
+    return game
+
+
+def load_game_state(game_id):
+    # Read-only access, so archived games are decoded in place.
+    game = find_online_game(game_id)
+    if game is None:
+        return None
+    elif isinstance(game, ArchivedGame):
+        board = game.to_board()
+    else:
+        board = BigBoard.from_json(game.board)
+    return {
+        "timestamp": game.timestamp,
+        "count": len(board.get_move_history()),
+        "xPASS": game.xPASS,
+        "oPASS": game.oPASS,
+        "board": board,
+    }
+
+
+def get_online_board(game_id):
+    state = get_game_state(game_id, load_game_state)
+    return state["board"] if state is not None else None
+
+
+def render_online_game(game_id, board, player):
+    # Renders the game as seen by a player ("X" or "O") or by a spectator (None).
+    if board.is_over():
+        return render_template(
+            "game-over.html",
+            board_html=render_board(board.get_board()),
+            winner=board.check_winner(),
+        )
+    elif board.get_turn() != player:
+        return render_template(
+            "online-game.html",
+            board_html=render_board(board.get_board()),
+            turn=board.get_turn(),
+            choice=board.is_choosing(),
+            wait=True,
+            spectator=player is None,
+            game_id=game_id,
+        )
+    else:
+        return render_template(
+            "online-game.html",
+            board_html=render_board(
+                board.get_board(),
+                "main.online_play",
+                board.get_turn(),
+                board.get_valid_moves(),
+                board.is_choosing(),
+            ),
+            turn=board.get_turn(),
+            choice=board.is_choosing(),
+            wait=False,
+            spectator=False,
+            game_id=game_id,
+        )
+
+
+@main.route("/")
 def index():
     return render_template("index.html")
 
 
-@app.route("/game")
+@main.route("/game")
 def game():
     if "board" not in session:
         session["board"] = BigBoard().to_json()
@@ -100,34 +230,43 @@ def game():
 
     if board.is_over():
         return render_template(
-            "game-over.html", board=board.get_board(), winner=board.check_winner()
+            "game-over.html",
+            board_html=render_board(board.get_board()),
+            winner=board.check_winner(),
         )
     elif session["ai"] and board.get_turn() == "O":
         return make_ai_move()
     else:
         return render_template(
             "game.html",
-            board=board.get_board(),
+            board_html=render_board(
+                board.get_board(),
+                "main.play",
+                board.get_turn(),
+                board.get_valid_moves(),
+                board.is_choosing(),
+            ),
             turn=board.get_turn(),
-            valid=board.get_valid_moves(),
             choice=board.is_choosing(),
         )
 
 
-@app.route("/start-2P-game")
+@main.route("/start-2P-game")
 def start_2P_game():
     session["ai"] = False
+    session["ai_mode"] = None
     return clear_board()
 
 
-@app.route("/start-ai-game")
+@main.route("/start-ai-game")
 def start_ai_game():
     session["ai"] = True
-    session["ai_mode"] = "random"
+    mode = request.args.get("mode", "random")
+    session["ai_mode"] = mode if mode in AI_OPTIONS else "random"
     return clear_board()
 
 
-@app.route("/save-game")
+@main.route("/save-game")
 def save_game():
     if "board" in session:
 
@@ -151,10 +290,10 @@ def save_game():
 
             return response
 
-    return redirect(url_for("game"))
+    return redirect(url_for("main.game"))
 
 
-@app.route("/load-game", methods=["POST", "GET"])
+@main.route("/load-game", methods=["POST", "GET"])
 def load_game():
     if request.method == "GET":
         return render_template("load-game.html")
@@ -177,70 +316,85 @@ def load_game():
                     big_row, big_col, sm_row, sm_col = move
                     new_game.make_move(big_row, big_col, sm_row, sm_col)
                 session["board"] = new_game.to_json()
+                session["analysis_id"] = uuid4().hex
         except Exception:
             message = "Could not load the game."
             flash(message, "danger")
 
-    return redirect(url_for("game"))
+    return redirect(url_for("main.game"))
 
 
-@app.route("/clear-board")
+@main.route("/clear-board")
 def clear_board():
     session["board"] = BigBoard().to_json()
-    return redirect(url_for("game"))
+    session["analysis_id"] = uuid4().hex
+    return redirect(url_for("main.game"))
 
 
-@app.route("/play/<int:board_row>/<int:board_col>/<int:row>/<int:col>")
+@main.route("/play/<int:board_row>/<int:board_col>/<int:row>/<int:col>")
 def play(board_row, board_col, row, col):
     if "board" in session:
         board = BigBoard.from_json(session["board"])
         small = str(3 * board_row + board_col)
         valid_moves = board.get_valid_moves()
 
-        if board.is_choosing():
+        if board.is_choosing() and small in valid_moves:
             row, col = valid_moves[small][0]
         if (small in valid_moves) and ((row, col) in valid_moves[small]):
             board.make_move(board_row, board_col, row, col)
 
         session["board"] = board.to_json()
 
-    return redirect(url_for("game"))
+    return redirect(url_for("main.game"))
 
 
-@app.route("/make-ai-move")
+@main.route("/make-ai-move")
 def make_ai_move():
     if "board" in session:
         board = BigBoard.from_json(session["board"])
+        if board.is_over():
+            return redirect(url_for("main.game"))
         b_row, b_col, s_row, s_col = choose_move(board, session.get("ai_mode", None))
-        return play(b_row, b_col, s_row, s_col)
+        response = play(b_row, b_col, s_row, s_col)
+        if session.get("ai", False) and session.get("ai_mode", None) == "playouts":
+            if "ponder_id" not in session:
+                session["ponder_id"] = uuid4().hex
+            board = BigBoard.from_json(session["board"])
+            start_pondering(session["ponder_id"], board, "O")
+        return response
 
-    return redirect(url_for("game"))
+    return redirect(url_for("main.game"))
 
 
-@app.route("/play-by-play")
+@main.route("/play-by-play")
 def move_history():
+    analysis = []
     if "board" in session:
         moves = BigBoard.from_json(session["board"]).get_move_history()
+        if "analysis_id" not in session:
+            session["analysis_id"] = uuid4().hex
+        analysis = get_analysis("local-{}".format(session["analysis_id"]), moves)
     else:
         moves = []
-    return render_template("play-by-play.html", moves=moves)
+    return render_template("play-by-play.html", moves=moves, analysis=analysis)
 
 
-@app.route("/rules")
+@main.route("/rules")
 def game_rules():
     return render_template("rules.html")
 
 
-@app.route("/online/home")
+@main.route("/online/home")
 def online_home():
     return render_template(
         "online-home.html",
         active_online_id=session.get("active_online_id", None),
         new_game_id=session.get("newly_created_id", None),
+        imported_ids=session.pop("imported_ids", None),
     )
 
 
-@app.route("/online/create", methods=["POST"])
+@main.route("/online/create", methods=["POST"])
 def online_create():
     if str(request.referrer).replace(request.host_url, "").startswith("online/home"):
         xPASS, oPASS = request.form.get("xPASS"), request.form.get("oPASS")
@@ -270,18 +424,18 @@ def online_create():
 
         session["newly_created_id"] = new_game.id
 
-        return redirect(url_for("online_home"))
+        return redirect(url_for("main.online_home"))
 
     abort(401)
 
 
-@app.route("/online/join", methods=["POST"])
+@main.route("/online/join", methods=["POST"])
 def online_join():
     if str(request.referrer).replace(request.host_url, "").startswith("online/home"):
         game_id = request.form.get("game_id")
         assert (
-            len(game_id) <= 6 and game_id.isdigit() and int(game_id) <= 10000
-        ), "Invalid Game ID; it should be a number between 1 and 10000"
+            len(game_id) <= 10 and game_id.isdigit() and int(game_id) > 0
+        ), "Invalid Game ID; it should be a positive number"
 
         player = request.form.get("player")
         assert player in ("X", "O"), "Invalid player selection."
@@ -291,7 +445,7 @@ def online_join():
             4, 25
         ), "The game password should be between 4 and 24 characters long."
 
-        game = OnlineGame.query.filter_by(id=game_id).first()
+        game = find_online_game(game_id)
         assert game, "Unable to get game #{}".format(game_id)
         assert bcrypt.check_password_hash(
             (game.xPASS if player == "X" else game.oPASS), password
@@ -304,55 +458,108 @@ def online_join():
         if session.get("newly_created_id", None) == session["active_online_id"]:
             del session["newly_created_id"]
 
-        return redirect(url_for("online_game"))
+        return redirect(url_for("main.online_game"))
+
+    abort(401)
+
+
+@main.route("/online/import", methods=["POST"])
+def online_import():
+    if str(request.referrer).replace(request.host_url, "").startswith("online/home"):
+        xPASS, oPASS = request.form.get("xPASS"), request.form.get("oPASS")
+        assert len(xPASS) in range(
+            4, 25
+        ), "The password for player X should be between 4 and 24 characters long."
+        assert len(oPASS) in range(
+            4, 25
+        ), "The password for player O should be between 4 and 24 characters long."
+        assert xPASS != oPASS, "The passwords for the players cannot be the same!"
+
+        try:
+            games = [load(f) for f in request.files.getlist("game_json")]
+            ids = import_games(
+                db,
+                OnlineGame.__table__,
+                games,
+                bcrypt.generate_password_hash(xPASS).decode("utf8"),
+                bcrypt.generate_password_hash(oPASS).decode("utf8"),
+            )
+        except Exception as exc:
+            raise AssertionError("Could not import the games: {}".format(exc))
+
+        session["imported_ids"] = (len(ids), ids[0], ids[-1]) if ids else None
+
+        return redirect(url_for("main.online_home"))
 
     abort(401)
 
 
-@app.route("/online/game")
+@main.route("/online/export")
+def online_export():
+    # Disabled unless an EXPORT_TOKEN is configured and given as ?token=...
+    token = getenv("EXPORT_TOKEN", None)
+    if token is None or request.args.get("token") != token:
+        abort(404)
+
+    query = (
+        OnlineGame.query.with_entities(
+            OnlineGame.id, OnlineGame.timestamp, OnlineGame.board
+        )
+        .filter(OnlineGame.board.isnot(None))
+        .order_by(OnlineGame.id)
+    )
+    archived_query = ArchivedGame.query.with_entities(
+        ArchivedGame.id, ArchivedGame.timestamp, ArchivedGame.start, ArchivedGame.moves
+    ).order_by(ArchivedGame.id)
+    return Response(
+        stream_with_context(export_games(query, archived_query)),
+        mimetype="application/x-ndjson",
+    )
+
+
+@main.route("/online/game")
 def online_game():
     if "active_online_id" not in session:
-        return redirect(url_for("online_home"))
+        return redirect(url_for("main.online_home"))
 
-    game = OnlineGame.query.filter_by(id=session["active_online_id"]).first()
-    assert game, "Unable to get game #{}".format(session["active_online_id"])
+    game_id = session["active_online_id"]
+    player = session["online_player"]
+    state = get_game_state(game_id, load_game_state)
+    assert state, "Unable to get game #{}".format(game_id)
     assert session["online_pass"] == (
-        game.xPASS if session["online_player"] == "X" else game.oPASS
-    ), "Wrong password for player {} in game #{}!".format(
-        session["online_player"], game.id
+        state["xPASS"] if player == "X" else state["oPASS"]
+    ), "Wrong password for player {} in game #{}!".format(player, game_id)
+
+    return get_view(
+        game_id,
+        state,
+        player,
+        lambda: render_online_game(game_id, state["board"], player),
     )
 
-    board = BigBoard.from_json(game.board)
 
-    if board.is_over():
-        return render_template(
-            "game-over.html", board=board.get_board(), winner=board.check_winner()
-        )
-    elif board.get_turn() != session["online_player"]:
-        return render_template(
-            "online-game.html",
-            board=board.get_board(),
-            turn=board.get_turn(),
-            valid=[],
-            choice=board.is_choosing(),
-            wait=True,
-            game_id=game.id,
-        )
-    else:
-        return render_template(
-            "online-game.html",
-            board=board.get_board(),
-            turn=board.get_turn(),
-            valid=board.get_valid_moves(),
-            choice=board.is_choosing(),
-            wait=False,
-            game_id=game.id,
-        )
+@main.route("/online/watch/<int:game_id>")
+def online_watch(game_id):
+    # Read-only view for spectators, shared by everyone watching the same game.
+    state = get_game_state(game_id, load_game_state)
+    assert state, "Unable to get game #{}".format(game_id)
 
+    return get_view(
+        game_id,
+        state,
+        "spectator",
+        lambda: render_online_game(game_id, state["board"], None),
+    )
 
-@app.route("/online/play/<int:board_row>/<int:board_col>/<int:row>/<int:col>")
+
+@main.route("/online/play/<int:board_row>/<int:board_col>/<int:row>/<int:col>")
 def online_play(board_row, board_col, row, col):
-    game = OnlineGame.query.filter_by(id=session["active_online_id"]).first()
+    # Finished games can only be viewed, so they stay archived.
+    state = get_game_state(session["active_online_id"], load_game_state)
+    if state is not None and state["board"].is_over():
+        return redirect(url_for("main.online_game"))
+
+    game = get_online_game(session["active_online_id"])
     assert game, "Unable to get game #{}".format(session["active_online_id"])
     assert session["online_pass"] == (
         game.xPASS if session["online_player"] == "X" else game.oPASS
@@ -367,35 +574,40 @@ def online_play(board_row, board_col, row, col):
     small = str(3 * board_row + board_col)
     valid_moves = board.get_valid_moves()
 
-    if board.is_choosing():
+    if board.is_choosing() and small in valid_moves:
         row, col = valid_moves[small][0]
 
     if (small in valid_moves) and ((row, col) in valid_moves[small]):
         board.make_move(board_row, board_col, row, col)
+        game.last_move = datetime.utcnow().isoformat()
 
     game.board = board.to_json()
     db.session.commit()
+    invalidate(game.id)
 
-    return redirect(url_for("online_game"))
+    return redirect(url_for("main.online_game"))
 
 
-@app.route("/online/play-by-play")
+@main.route("/online/play-by-play")
 def online_move_history():
     moves = []
+    analysis = []
     if "active_online_id" in session:
-        game = OnlineGame.query.filter_by(id=session["active_online_id"]).first()
-        assert game, "Unable to get game #{}".format(session["active_online_id"])
-        moves = BigBoard.from_json(game.board).get_move_history()
-    return render_template("online-play-by-play.html", moves=moves)
+        game_id = session["active_online_id"]
+        board = get_online_board(game_id)
+        assert board, "Unable to get game #{}".format(game_id)
+        moves = board.get_move_history()
+        analysis = get_analysis("online-{}".format(game_id), moves)
+    return render_template("online-play-by-play.html", moves=moves, analysis=analysis)
 
 
-@app.route("/online/save-game")
+@main.route("/online/save-game")
 def online_save_game():
     if "active_online_id" in session:
-        game = OnlineGame.query.filter_by(id=session["active_online_id"]).first()
-        assert game, "Unable to get game #{}".format(session["active_online_id"])
+        board = get_online_board(session["active_online_id"])
+        assert board, "Unable to get game #{}".format(session["active_online_id"])
 
-        moves = BigBoard.from_json(game.board).get_move_history()
+        moves = board.get_move_history()
 
         if moves:
             export = {
@@ -416,19 +628,19 @@ def online_save_game():
 
             return response
 
-    return redirect(url_for("online_game"))
+    return redirect(url_for("main.online_game"))
 
 
-@app.route("/code/")
+@main.route("/code/")
 def source_code():
     return redirect("https://github.com/cbdm/tic-tac-ception")
 
 
-@app.errorhandler(Exception)
+@main.app_errorhandler(Exception)
 def not_found(exc):
     code = exc.code if isinstance(exc, HTTPException) else 500
     return render_template("error.html", code=code, error=str(exc)), code
 
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    create_app().run(debug=True)
@@ -0,0 +1,129 @@
+"""game_archive.py
+
+Author: Caio Batista de Melo
+Date Created: 2026-10-19
+Date Modified: 2026-10-19
+Description: Compact binary archive of generated games with random access.
+"""
+
+import argparse
+from collections.abc import Mapping
+from json import dumps, load
+
+import numpy as np
+from encoding import CODES, decode_move_history, encode_history
+
+PLAYERS = {code: player for player, code in CODES.items()}
+
+# Layout: a file header, an index with the offset of each game, then the games. Each
+# game is a header followed by one byte per move (see encoding.py).
+MAGIC = b"TTCA"
+VERSION = 1
+FILE_HEADER = np.dtype([("magic", "S4"), ("version", "<u4"), ("count", "<u8")])
+GAME_HEADER = np.dtype([("start", "u1"), ("winner", "u1"), ("length", "<u2")])
+
+
+def write_archive(games, f):
+    # Writes an iterable of {"moves", "winner"} games (as in generate_games.py) to a
+    # binary file; board choices keep only the board, not the cell.
+    records = []
+    for game in games:
+        moves = game["moves"]
+        data = encode_history(moves)
+        header = np.array(
+            [(CODES[moves[0][0]] if moves else 0, CODES[game["winner"]], len(data))],
+            dtype=GAME_HEADER,
+        )
+        records.append(header.tobytes() + data)
+
+    start = FILE_HEADER.itemsize + 8 * len(records)
+    offsets = np.cumsum([start] + [len(r) for r in records[:-1]], dtype="<u8")
+    f.write(np.array([(MAGIC, VERSION, len(records))], dtype=FILE_HEADER).tobytes())
+    f.write(offsets[: len(records)].tobytes())
+    for record in records:
+        f.write(record)
+
+
+class GameArchive(Mapping):
+    """Reads an archive lazily, with the same keys and values as generate_games.py.
+
+    The file is memory-mapped, so only the games that are accessed get decoded.
+    """
+
+    def __init__(self, path):
+        self._data = np.memmap(path, dtype=np.uint8, mode="r")
+        header = self._data[: FILE_HEADER.itemsize].view(FILE_HEADER)[0]
+        if header["magic"] != MAGIC or header["version"] != VERSION:
+            raise ValueError("{} is not a game archive".format(path))
+
+        start, count = FILE_HEADER.itemsize, int(header["count"])
+        end = start + 8 * count
+        self._offsets = self._data[start:end].view("<u8")
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __iter__(self):
+        return (f"game#{i}" for i in range(len(self)))
+
+    def __getitem__(self, key):
+        if not isinstance(key, str) or not key.startswith("game#"):
+            raise KeyError(key)
+        index = key.partition("#")[2]
+        if not index.isdigit() or int(index) >= len(self):
+            raise KeyError(key)
+        return self.get_game(int(index))
+
+    def get_record(self, index):
+        # Returns (start, winner, encoded moves) without replaying the game.
+        offset = int(self._offsets[index])
+        end = offset + GAME_HEADER.itemsize
+        start, winner, length = self._data[offset:end].view(GAME_HEADER)[0].item()
+        stop = end + length
+        moves = self._data[end:stop].tobytes()
+        return PLAYERS[start], PLAYERS[winner], moves
+
+    def get_game(self, index):
+        start, winner, moves = self.get_record(index)
+        return {"moves": decode_move_history(start, moves), "winner": winner}
+
+
+def load_games(f):
+    # Reads games in either format written by generate_games.py, from a binary file.
+    if f.read(len(MAGIC)) == MAGIC:
+        return GameArchive(f.name)
+    f.seek(0)
+    try:
+        return load(f)
+    except ValueError as e:  # Also raised for bytes that aren't UTF-8.
+        raise ValueError("{} is not a JSON file or game archive".format(f.name)) from e
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="This script converts generated games to or from an archive."
+    )
+    parser.add_argument(
+        "-i",
+        "--file_in",
+        help="filename to read the games (JSON or archive)",
+        required=True,
+        type=argparse.FileType("rb"),
+    )
+    parser.add_argument(
+        "-o",
+        "--file_out",
+        help="filename to write the converted games",
+        required=True,
+        type=argparse.FileType("wb"),
+    )
+    args = parser.parse_args()
+
+    games = load_games(args.file_in)
+    args.file_in.close()
+    if isinstance(games, GameArchive):
+        args.file_out.write(dumps(dict(games)).encode())
+    else:
+        write_archive(games.values(), args.file_out)
+    args.file_out.close()
+    print(f"Converted {len(games)} games")
@@ -2,14 +2,14 @@
 
 Author: Caio Batista de Melo
 Date Created: 2020-12-28
-Date Modified: 2020-12-28
+Date Modified: 2026-10-19
 Description: Generates random games that can be used to train AI models.
 """
 
 import argparse
 from json import dumps
 from math import ceil
-from sys import stdout
+from sys import stderr, stdout
 
 from ai_options import Random
 from bigboard import BigBoard
@@ -21,7 +21,7 @@ def generate_n_games(n, verbose, pct):
 
     for i in range(n):
         if verbose and i % parts == 0:
-            print(f"Generating game #{i} ({((i+1)/n)*100:.2f}%)")
+            print(f"Generating game #{i} ({((i+1)/n)*100:.2f}%)", file=stderr)
 
         new_game = BigBoard()
         while not new_game.is_over():
@@ -34,7 +34,26 @@ def generate_n_games(n, verbose, pct):
         }
 
     if verbose:
-        print("Done")
+        print("Done", file=stderr)
+
+    return games
+
+
+def generate_n_games_batched(n, verbose, seed=None):
+    # Lazy import so the default (pure Python) generator doesn't need numpy.
+    from batch_playout import play_random_games
+
+    if verbose:
+        print(f"Generating {n} games in a single batch", file=stderr)
+
+    histories, winners = play_random_games(n, seed)
+    games = {
+        f"game#{i}": {"moves": moves, "winner": winner}
+        for i, (moves, winner) in enumerate(zip(histories, winners))
+    }
+
+    if verbose:
+        print("Done", file=stderr)
 
     return games
 
@@ -52,7 +71,13 @@ if __name__ == "__main__":
     parser.add_argument(
         "-n", "--num", help="how many games it should generate", default=10, type=int
     )
-    parser.add_argument("-v", "--verbose", default=True, type=bool)
+    # Progress goes to stderr, so it never mixes with the games written to stdout.
+    parser.add_argument(
+        "-v", "--verbose", help="show progress (default)", action="store_true"
+    )
+    parser.add_argument(
+        "-q", "--quiet", help="hide progress", action="store_false", dest="verbose"
+    )
     parser.add_argument(
         "-p",
         "--pct",
@@ -60,9 +85,37 @@ if __name__ == "__main__":
         default=5,
         type=float,
     )
+    parser.add_argument(
+        "-b",
+        "--batch",
+        help="play all games at once with the numpy batch engine",
+        action="store_true",
+        default=False,
+    )
+    parser.add_argument(
+        "-s", "--seed", help="random seed for the batch engine", default=None, type=int
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        help="write JSON or a compact binary archive (see game_archive.py)",
+        choices=("json", "archive"),
+        default="json",
+    )
+    parser.set_defaults(verbose=True)
     args = parser.parse_args()
 
-    games = generate_n_games(args.num, args.verbose, args.pct)
+    if args.batch:
+        games = generate_n_games_batched(args.num, args.verbose, args.seed)
+    else:
+        games = generate_n_games(args.num, args.verbose, args.pct)
+
+    if args.format == "archive":
+        # Lazy import so the JSON output doesn't need numpy.
+        from game_archive import write_archive
 
-    args.out.write(dumps(games))
+        args.out.flush()
+        write_archive(games.values(), args.out.buffer)
+    else:
+        args.out.write(dumps(games))
     args.out.close()
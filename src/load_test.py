@@ -0,0 +1,284 @@
+"""load_test.py
+
+Author: Caio Batista de Melo
+Date Created: 2026-10-19
+Date Modified: 2026-10-19
+Description: Simulates concurrent online and AI games and reports per-route latency.
+"""
+
+import argparse
+import random
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import CookieJar
+from os.path import join
+from tempfile import gettempdir
+from threading import Lock
+from time import perf_counter, sleep
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import (
+    HTTPCookieProcessor,
+    HTTPRedirectHandler,
+    Request,
+    build_opener,
+)
+
+from ai_options import AI_OPTIONS
+from arena import percentile
+
+GAME_ID = re.compile(r"join using ID #(\d+)")
+LOCAL_MOVES = re.compile(r'href="(/play/\d/\d/\d/\d)"')
+ONLINE_MOVES = re.compile(r'href="(/online/play/\d/\d/\d/\d)"')
+MAX_REQUESTS_PER_GAME = 400
+
+
+class AppClient(object):
+    # Drives the app in-process, with its own cookies (i.e. its own session).
+    def __init__(self, app):
+        self._client = app.test_client()
+
+    def request(self, method, path, data=None, headers=None):
+        response = self._client.open(path, method=method, data=data, headers=headers)
+        return response.status_code, response.get_data(as_text=True)
+
+
+class _NoRedirects(HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HTTPClient(object):
+    # Drives a running server, with its own cookie jar.
+    def __init__(self, url):
+        self._url = url.rstrip("/")
+        self._opener = build_opener(HTTPCookieProcessor(CookieJar()), _NoRedirects)
+
+    def request(self, method, path, data=None, headers=None):
+        body = urlencode(data).encode() if data is not None else None
+        request = Request(self._url + path, body, headers or {}, method=method)
+        try:
+            with self._opener.open(request) as response:
+                return response.status, response.read().decode()
+        except HTTPError as error:
+            # Redirects aren't followed, so they also end up here.
+            return error.code, error.read().decode()
+
+
+class Recorder(object):
+    def __init__(self):
+        self._lock = Lock()
+        self._latencies = defaultdict(list)
+        self._errors = defaultdict(int)
+
+    def request(self, client, route, method, path, data=None, headers=None):
+        start = perf_counter()
+        try:
+            status, text = client.request(method, path, data, headers)
+        except Exception:
+            status, text = None, ""
+        elapsed = perf_counter() - start
+
+        with self._lock:
+            self._latencies[route].append(elapsed)
+            if status is None or status >= 400:
+                self._errors[route] += 1
+        return status, text
+
+    def report(self, duration):
+        rows = []
+        for route in sorted(self._latencies):
+            times = self._latencies[route]
+            rows.append(
+                {
+                    "route": route,
+                    "requests": len(times),
+                    "errors": self._errors[route],
+                    "p50_ms": 1000 * percentile(times, 50),
+                    "p95_ms": 1000 * percentile(times, 95),
+                    "p99_ms": 1000 * percentile(times, 99),
+                }
+            )
+        total = sum(row["requests"] for row in rows)
+        errors = sum(row["errors"] for row in rows)
+        return rows, total / duration, (errors / total if total else 0)
+
+
+def play_ai_game(client, recorder, rng, think, mode):
+    # Plays against the AI, sometimes letting the AI pick the human's move too.
+    recorder.request(
+        client, "/start-ai-game", "GET", "/start-ai-game?" + urlencode({"mode": mode})
+    )
+    for _ in range(MAX_REQUESTS_PER_GAME):
+        unused_status, page = recorder.request(client, "/game", "GET", "/game")
+        if "Game Over" in page:
+            return
+        moves = LOCAL_MOVES.findall(page)
+        if not moves:
+            # The AI moved instead and redirected back to /game.
+            continue
+        sleep(think)
+        if rng.random() < 0.25:
+            recorder.request(client, "/make-ai-move", "GET", "/make-ai-move")
+        else:
+            recorder.request(client, "/play", "GET", rng.choice(moves))
+
+
+def play_online_game(clients, recorder, rng, think, referrer):
+    # Creates a game with one player, joins with both and plays until it's over.
+    x_client, o_client = clients
+    headers = {"Referer": referrer}
+    passwords = {"xPASS": "x-pass", "oPASS": "o-pass"}
+
+    recorder.request(
+        x_client, "/online/create", "POST", "/online/create", passwords, headers
+    )
+    unused_status, page = recorder.request(
+        x_client, "/online/home", "GET", "/online/home"
+    )
+    game_id = GAME_ID.search(page)
+    if game_id is None:
+        return
+
+    for client, player in ((x_client, "X"), (o_client, "O")):
+        form = {
+            "game_id": game_id.group(1),
+            "player": player,
+            "password": passwords[player.lower() + "PASS"],
+        }
+        recorder.request(client, "/online/join", "POST", "/online/join", form, headers)
+
+    for _ in range(MAX_REQUESTS_PER_GAME):
+        moves = []
+        for client in clients:
+            unused_status, page = recorder.request(
+                client, "/online/game", "GET", "/online/game"
+            )
+            if "Game Over" in page:
+                return
+            moves = moves or [(client, m) for m in ONLINE_MOVES.findall(page)]
+        if moves:
+            sleep(think)
+            client, move = rng.choice(moves)
+            recorder.request(client, "/online/play", "GET", move)
+
+
+def run_player(
+    make_client, recorder, seed, deadline, ai_share, ai_mode, think, referrer
+):
+    # Keeps starting new games until the deadline.
+    rng = random.Random(seed)
+    games = 0
+    while perf_counter() < deadline:
+        if rng.random() < ai_share:
+            play_ai_game(make_client(), recorder, rng, think, ai_mode)
+        else:
+            clients = (make_client(), make_client())
+            play_online_game(clients, recorder, rng, think, referrer)
+        games += 1
+    return games
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="This script load tests the server with simulated players."
+    )
+    parser.add_argument(
+        "-n", "--players", help="number of concurrent players", default=8, type=int
+    )
+    parser.add_argument(
+        "-d", "--duration", help="seconds to keep playing", default=30, type=float
+    )
+    parser.add_argument(
+        "-a",
+        "--ai-share",
+        help="fraction of the games that are played against the AI",
+        default=0.5,
+        type=float,
+    )
+    parser.add_argument(
+        "-m",
+        "--ai-mode",
+        help="AI the simulated players play against",
+        choices=sorted(AI_OPTIONS),
+        default="random",
+    )
+    parser.add_argument(
+        "-t",
+        "--think",
+        help="seconds each player waits per move",
+        default=0,
+        type=float,
+    )
+    parser.add_argument(
+        "-u",
+        "--url",
+        help="base URL of a running server (default: run the app in-process)",
+        default=None,
+    )
+    parser.add_argument(
+        "--db",
+        help="database URI for the in-process app (default: a temporary SQLite file)",
+        default="sqlite:///" + join(gettempdir(), "tic-tac-ception-load-test.db"),
+    )
+    parser.add_argument(
+        "-s", "--seed", help="seed of the first player", default=0, type=int
+    )
+    args = parser.parse_args()
+
+    if args.url is not None:
+        referrer = args.url.rstrip("/") + "/online/home"
+
+        def make_client():
+            return HTTPClient(args.url)
+
+    else:
+        from game import create_app, db
+
+        config = {"SQLALCHEMY_DATABASE_URI": args.db}
+        if args.db.startswith("sqlite"):
+            # Wait for the writer lock instead of failing right away.
+            config["SQLALCHEMY_ENGINE_OPTIONS"] = {"connect_args": {"timeout": 30}}
+        app = create_app(config)
+        with app.app_context():
+            db.create_all()
+        referrer = "http://localhost/online/home"
+
+        def make_client():
+            return AppClient(app)
+
+    recorder = Recorder()
+    start = perf_counter()
+    deadline = start + args.duration
+    with ThreadPoolExecutor(max_workers=args.players) as pool:
+        jobs = [
+            pool.submit(
+                run_player,
+                make_client,
+                recorder,
+                args.seed + i,
+                deadline,
+                args.ai_share,
+                args.ai_mode,
+                args.think,
+                referrer,
+            )
+            for i in range(args.players)
+        ]
+        games = sum(job.result() for job in jobs)
+    duration = perf_counter() - start
+
+    rows, throughput, error_rate = recorder.report(duration)
+    print(
+        f"{'Route':<16}{'Requests':>10}{'Errors':>8}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    )
+    for row in rows:
+        print(
+            f"{row['route']:<16}{row['requests']:>10}{row['errors']:>8}"
+            f"{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}{row['p99_ms']:>10.2f}"
+        )
+    print(
+        f"Games: {games}, throughput: {throughput:.1f} req/s, errors: {error_rate:.2%}"
+    )
@@ -0,0 +1,29 @@
+"""last move and archive stubs
+
+Revision ID: 8c2e4f6a1b3d
+Revises: 3f9a1c2b7d4e
+Create Date: 2026-10-19 11:45:12.904127
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8c2e4f6a1b3d"
+down_revision = "3f9a1c2b7d4e"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("saved_games", sa.Column("last_move", sa.Text(), nullable=True))
+    # Games archived before stubs existed get one, so their ids can't be reused.
+    op.execute(
+        "INSERT INTO saved_games (id) SELECT id FROM archived_games "
+        "WHERE id NOT IN (SELECT id FROM saved_games)"
+    )
+
+
+def downgrade():
+    op.execute("DELETE FROM saved_games WHERE board IS NULL")
+    op.drop_column("saved_games", "last_move")
@@ -0,0 +1,117 @@
+"""opening_book.py
+
+Author: Caio Batista de Melo
+Date Created: 2026-10-19
+Date Modified: 2026-10-19
+Description: Builds and reads an opening book from generated games.
+"""
+
+import argparse
+
+import numpy as np
+from bigboard import BigBoard
+from encoding import encode_move, move_to_play, position_key
+from game_archive import load_games
+
+# One row per (position, move) pair, sorted so all moves of a position are contiguous.
+BOOK_DTYPE = np.dtype(
+    [("key", "<u8"), ("move", "u1"), ("x", "<u4"), ("o", "<u4"), ("draw", "<u4")]
+)
+RESULTS = {"X": "x", "O": "o", None: "draw"}
+
+
+def collect_stats(games, plies, stats=None):
+    # Counts the results after each (position, move) in the first plies of the games.
+    stats = {} if stats is None else stats
+    for game in games.values():
+        moves = game["moves"]
+        if not moves:
+            continue
+        result = RESULTS[game["winner"]]
+
+        board = BigBoard()
+        board._turn = moves[0][0]
+        for (unused_turn, b_r, b_c, s_r, s_c, choice) in moves[:plies]:
+            entry = (position_key(board), encode_move(b_r, b_c, s_r, s_c, choice))
+            counts = stats.setdefault(entry, {"x": 0, "o": 0, "draw": 0})
+            counts[result] += 1
+            board.make_move(b_r, b_c, s_r, s_c)
+
+    return stats
+
+
+def build_book(stats):
+    return np.array(
+        [
+            (key, move, counts["x"], counts["o"], counts["draw"])
+            for (key, move), counts in sorted(stats.items())
+        ],
+        dtype=BOOK_DTYPE,
+    )
+
+
+class OpeningBook(object):
+    def __init__(self, path, plies, min_games=10):
+        # Memory-mapped, so workers share the pages and only touch what they read.
+        self._book = np.load(path, mmap_mode="r")
+        self._keys = self._book["key"]
+        self._plies = plies
+        self._min_games = min_games
+
+    def get_stats(self, board):
+        # Returns the rows for every move seen from this position.
+        key = np.uint64(position_key(board))
+        first = np.searchsorted(self._keys, key, side="left")
+        last = np.searchsorted(self._keys, key, side="right")
+        return self._book[first:last]
+
+    def choose_best_move(self, board):
+        # Returns the move with the best average result for the player to move, or
+        # None if the position is out of the book.
+        if len(board.get_move_history()) >= self._plies:
+            return None
+
+        rows = self.get_stats(board)
+        games = rows["x"].astype(np.int64) + rows["o"] + rows["draw"]
+        rows, games = rows[games >= self._min_games], games[games >= self._min_games]
+        if not len(rows):
+            return None
+
+        mover, other = ("x", "o") if board.get_turn() == "X" else ("o", "x")
+        scores = (rows[mover].astype(np.int64) - rows[other]) / games
+        return move_to_play(board, int(rows["move"][scores.argmax()]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="This script builds an opening book from generated games."
+    )
+    parser.add_argument(
+        "-i",
+        "--files_in",
+        help="filenames to read the generated games (JSON or archive)",
+        required=True,
+        nargs="+",
+        type=argparse.FileType("rb"),
+    )
+    parser.add_argument(
+        "-o",
+        "--file_out",
+        help="filename to export the opening book (.npy)",
+        required=True,
+        type=argparse.FileType("wb"),
+    )
+    parser.add_argument(
+        "-n", "--plies", help="how many plies the book covers", default=8, type=int
+    )
+    args = parser.parse_args()
+
+    stats = {}
+    for file_in in args.files_in:
+        collect_stats(load_games(file_in), args.plies, stats)
+        file_in.close()
+
+    book = build_book(stats)
+    print("Book entries:", len(book))
+    np.save(args.file_out, book)
+    args.file_out.close()
@@ -2,15 +2,15 @@
 
 Author: Caio Batista de Melo
 Date Created: 2020-12-28
-Date Modified: 2020-12-28
+Date Modified: 2026-10-19
 Description: Read generated games and creates a feature set.
 """
 
 import argparse
-from json import load
 
 import numpy as np
 from bigboard import BigBoard
+from game_archive import load_games
 
 
 def rate_moves(player_moves, outcome):
@@ -96,9 +96,9 @@ if __name__ == "__main__":
     parser.add_argument(
         "-i",
         "--file_in",
-        help="filename to read the generated games",
+        help="filename to read the generated games (JSON or archive)",
         required=True,
-        type=argparse.FileType("r"),
+        type=argparse.FileType("rb"),
     )
     parser.add_argument(
         "-o",
@@ -109,7 +109,7 @@ if __name__ == "__main__":
     )
     parser.add_argument("-v", "--verbose", action="store_true", default=False)
     args = parser.parse_args()
-    games = load(args.file_in)
+    games = load_games(args.file_in)
     X, y = parse_data(games, verbose=args.verbose)
     print("Data points' shape:", X.shape)
     print("Sample data point:", X[0])
@@ -0,0 +1,123 @@
+"""perft.py
+
+Author: Caio Batista de Melo
+Date Created: 2026-10-19
+Date Modified: 2026-10-19
+Description: Counts the positions reachable in d moves to check the move generator.
+"""
+
+import argparse
+from json import load
+from time import perf_counter
+
+from bigboard import BigBoard
+
+# Leaf counts by depth for known positions, where board choices count as moves. Any
+# other engine has to match these to follow the rules of BigBoard. Small boards can
+# only be won after a few plies, so "midgame" covers the choosing-board rule.
+REFERENCE = {
+    "empty": {
+        "start": "X",
+        "moves": [],
+        "counts": {1: 81, 2: 720, 3: 6336, 4: 55080, 5: 473256},
+    },
+    "midgame": {
+        "start": "X",
+        # fmt: off
+        "moves": [
+            (1, 2, 0, 2), (0, 2, 0, 0), (0, 0, 2, 2), (2, 2, 1, 2), (1, 2, 1, 1),
+            (1, 1, 0, 1), (0, 1, 2, 0), (2, 0, 1, 0), (1, 0, 2, 2), (2, 2, 0, 0),
+            (0, 0, 1, 0), (1, 0, 2, 0), (2, 0, 1, 1), (1, 1, 1, 0), (1, 0, 1, 0),
+            (1, 0, 1, 2), (1, 2, 2, 0), (2, 0, 2, 0), (2, 0, 0, 0), (0, 0, 0, 2),
+            (0, 2, 0, 2), (0, 2, 2, 0), (2, 0, 2, 1), (2, 1, 1, 2), (2, 2, 2, 0),
+            (2, 0, 1, 2), (1, 1, 0, 2), (0, 2, 2, 2), (2, 2, 0, 1), (0, 1, 2, 2),
+            (2, 2, 2, 1), (2, 1, 0, 1),
+        ],
+        # fmt: on
+        "counts": {1: 7, 2: 43, 3: 376, 4: 2241},
+    },
+}
+
+
+def perft(board, depth):
+    if depth == 0:
+        return 1
+    moves = board.get_legal_moves()
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for move in moves:
+        child = board.copy()
+        child.make_move(*move)
+        nodes += perft(child, depth - 1)
+    return nodes
+
+
+def divide(board, depth):
+    # Leaf counts split by the first move, to find where two engines disagree.
+    counts = {}
+    for move in board.get_legal_moves():
+        child = board.copy()
+        child.make_move(*move)
+        counts[move] = perft(child, depth - 1)
+    return counts
+
+
+def load_position(data):
+    # Replays a saved game ({"start", "moves"}) to get the position to start from.
+    board = BigBoard(turn=data["start"])
+    for move in data["moves"]:
+        board.make_move(*move)
+    return board
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="This script counts the leaf nodes of the game tree (perft)."
+    )
+    parser.add_argument("-d", "--depth", help="depth to search", default=3, type=int)
+    parser.add_argument(
+        "-p",
+        "--position",
+        help="reference position to start from",
+        choices=sorted(REFERENCE),
+        default="empty",
+    )
+    parser.add_argument(
+        "-i",
+        "--file_in",
+        help="saved game to start from instead of a reference position",
+        type=argparse.FileType("r"),
+        default=None,
+    )
+    parser.add_argument(
+        "--divide", help="show the counts for each first move", action="store_true"
+    )
+    args = parser.parse_args()
+
+    if args.file_in is not None:
+        board = load_position(load(args.file_in))
+        args.file_in.close()
+    else:
+        board = load_position(REFERENCE[args.position])
+
+    start = perf_counter()
+    if args.divide:
+        counts = divide(board, args.depth)
+        for (b_row, b_col, s_row, s_col), count in sorted(counts.items()):
+            choice = " (board choice)" if board.is_choosing() else ""
+            print(f"{b_row} {b_col} {s_row} {s_col}{choice}: {count}")
+        nodes = sum(counts.values())
+    else:
+        nodes = perft(board, args.depth)
+    elapsed = perf_counter() - start
+
+    print(f"Nodes: {nodes}")
+    print(f"Time: {elapsed:.3f}s ({nodes / max(elapsed, 1e-9):,.0f} nodes/s)")
+
+    reference = REFERENCE[args.position]["counts"]
+    if args.file_in is None and args.depth in reference:
+        expected = reference[args.depth]
+        status = "OK" if nodes == expected else f"MISMATCH (expected {expected})"
+        print(f"Reference: {status}")
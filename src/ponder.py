@@ -0,0 +1,98 @@
+"""ponder.py
+
+Author: Caio Batista de Melo
+Date Created: 2026-10-19
+Date Modified: 2026-10-19
+Description: Searches the opponent's replies in the background while they think.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from os import getenv
+from threading import Lock
+
+from cachelib import SimpleCache
+
+from ai_inference import choose_best_moves
+from encoding import position_key
+
+# Pondering uses more playouts than a regular move, since the human's think time pays
+# for them. Each session searches at most PONDER_MAX_POSITIONS positions, in chunks
+# of PONDER_CHUNK so a newer search can stop an older one early.
+PONDER_PLAYOUTS = int(getenv("PONDER_PLAYOUTS", 64))
+PONDER_MAX_POSITIONS = int(getenv("PONDER_MAX_POSITIONS", 81))
+PONDER_CHUNK = int(getenv("PONDER_CHUNK", 9))
+PONDER_WORKERS = int(getenv("PONDER_WORKERS", 1))
+
+# Maps position keys to the best move found for them. SimpleCache isn't thread-safe,
+# so it's only used while holding _lock.
+_results = SimpleCache(threshold=4000, default_timeout=600)
+# Maps each session to the token of its latest search; older searches stop when
+# they see a different token.
+_searches = {}
+_lock = Lock()
+_pool = None
+
+
+def expected_positions(board, player, limit=PONDER_MAX_POSITIONS):
+    # Positions where `player` is to move after each reply of the opponent; replies
+    # that leave the opponent choosing a board are followed through the choice.
+    positions = []
+    frontier = [board]
+    while frontier and len(positions) < limit:
+        current = frontier.pop()
+        for move in current.get_legal_moves():
+            after = current.copy()
+            after.make_move(*move)
+            if after.is_over():
+                continue
+            if after.get_turn() == player:
+                positions.append(after)
+            else:
+                frontier.append(after)
+    return positions[:limit]
+
+
+def _search(session_id, token, board, player):
+    try:
+        positions = expected_positions(board, player)
+        for start in range(0, len(positions), PONDER_CHUNK):
+            if _searches.get(session_id) is not token:
+                return
+            end = start + PONDER_CHUNK
+            chunk = positions[start:end]
+            moves = choose_best_moves(chunk, PONDER_PLAYOUTS)
+            with _lock:
+                for position, move in zip(chunk, moves):
+                    _results.set(position_key(position), move)
+    finally:
+        with _lock:
+            if _searches.get(session_id) is token:
+                del _searches[session_id]
+
+
+def _get_pool():
+    # Created lazily so forked web workers don't inherit running threads.
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=PONDER_WORKERS)
+    return _pool
+
+
+def start_pondering(session_id, board, player):
+    """Searches the positions `player` can face after the opponent's next move.
+
+    Replaces any search still running for the same session.
+    """
+    if board.is_over() or board.get_turn() == player:
+        return
+    token = object()
+    with _lock:
+        _searches[session_id] = token
+    _get_pool().submit(_search, session_id, token, board, player)
+
+
+def get_pondered_move(board):
+    # Returns the move found while pondering, or None if the position wasn't searched.
+    key = position_key(board)
+    with _lock:
+        return _results.get(key)
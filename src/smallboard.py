@@ -2,7 +2,7 @@
 
 Author: Caio Batista de Melo
 Date Created: 2020-11-06
-Last Modified: 2020-11-07
+Last Modified: 2026-10-19
 Description: Implements a class to keep track of a basic tic-tac-toe game.
 """
 
@@ -69,3 +69,9 @@ class SmallBoard(object):
 
     def get_board(self):
         return self._board
+
+    def copy(self):
+        board = SmallBoard.__new__(SmallBoard)
+        board._board = [list(row) for row in self._board]
+        board._winner = self._winner
+        return board
@@ -0,0 +1,220 @@
+"""static_assets.py
+
+Author: Caio Batista de Melo
+Date Created: 2026-10-19
+Date Modified: 2026-10-19
+Description: Fingerprints, precompresses and serves the static files from memory.
+"""
+
+import argparse
+from gzip import compress
+from hashlib import sha256
+from json import dump, load
+from mimetypes import guess_type
+from os import makedirs, walk
+from os.path import dirname, exists, join, relpath, splitext
+from threading import Lock
+
+from flask import Response, abort, request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; without it only gzip variants are made.
+    brotli = None
+
+STATIC_DIR = join(dirname(__file__), "static")
+BUILD_DIR = join(dirname(__file__), "static_build")
+MANIFEST = "manifest.json"
+
+# Fingerprinted files never change, so browsers can keep them for a year.
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+DEFAULT_CACHE = "public, max-age=3600"
+COMPRESSIBLE = (
+    ".css",
+    ".eot",
+    ".ico",
+    ".js",
+    ".svg",
+    ".ttf",
+    ".txt",
+    ".webmanifest",
+    ".xml",
+)
+ENCODINGS = ("br", "gzip")
+SUFFIXES = {"identity": "", "gzip": ".gz", "br": ".br"}
+
+
+def compress_variants(content, filename):
+    # Keeps only the encodings that actually make the file smaller.
+    variants = {}
+    if filename.endswith(COMPRESSIBLE):
+        candidates = {"gzip": compress(content, compresslevel=9)}
+        if brotli is not None:
+            candidates["br"] = brotli.compress(content, quality=11)
+        for encoding, data in candidates.items():
+            if len(data) < len(content):
+                variants[encoding] = data
+    return variants
+
+
+def build_assets(static_dir=STATIC_DIR):
+    # Maps each file's path (relative to static_dir) to its fingerprinted asset.
+    assets = {}
+    for root, unused_dirs, files in walk(static_dir):
+        for name in files:
+            path = join(root, name)
+            filename = relpath(path, static_dir).replace("\\", "/")
+            with open(path, "rb") as f:
+                content = f.read()
+
+            base, ext = splitext(filename)
+            digest = sha256(content).hexdigest()[:12]
+            assets[filename] = {
+                "fingerprinted": "{}.{}{}".format(base, digest, ext),
+                "etag": digest,
+                "mimetype": guess_type(filename)[0] or "application/octet-stream",
+                "identity": content,
+                **compress_variants(content, filename),
+            }
+    return assets
+
+
+def save_assets(assets, build_dir=BUILD_DIR):
+    manifest = {}
+    for filename, asset in assets.items():
+        out = join(build_dir, asset["fingerprinted"])
+        makedirs(dirname(out), exist_ok=True)
+        for encoding, suffix in SUFFIXES.items():
+            if encoding in asset:
+                with open(out + suffix, "wb") as f:
+                    f.write(asset[encoding])
+        manifest[filename] = {
+            "fingerprinted": asset["fingerprinted"],
+            "etag": asset["etag"],
+            "mimetype": asset["mimetype"],
+            "encodings": [e for e in ENCODINGS if e in asset],
+        }
+
+    with open(join(build_dir, MANIFEST), "w") as f:
+        dump(manifest, f, indent=2, sort_keys=True)
+
+
+def load_assets(build_dir=BUILD_DIR):
+    with open(join(build_dir, MANIFEST)) as f:
+        manifest = load(f)
+
+    assets = {}
+    for filename, asset in manifest.items():
+        path = join(build_dir, asset["fingerprinted"])
+        with open(path, "rb") as f:
+            asset["identity"] = f.read()
+        for encoding in asset.pop("encodings"):
+            with open(path + SUFFIXES[encoding], "rb") as f:
+                asset[encoding] = f.read()
+        assets[filename] = asset
+    return assets
+
+
+class StaticAssets(object):
+    """Serves the assets returned by load(), which is only called on first use.
+
+    Scripts that create the app without serving pages never pay for the build.
+    """
+
+    def __init__(self, load):
+        self._load = load
+        self._assets = None
+        self._files = None
+        self._lock = Lock()
+
+    def _get_files(self):
+        with self._lock:
+            if self._files is None:
+                self._assets = self._load()
+                # Both the original and the fingerprinted names can be requested.
+                self._files = {}
+                for filename, asset in self._assets.items():
+                    self._files[filename] = (asset, DEFAULT_CACHE)
+                    self._files[asset["fingerprinted"]] = (asset, IMMUTABLE_CACHE)
+            return self._assets, self._files
+
+    def init_app(self, app):
+        # Replaces Flask's static route and makes url_for("static", ...) fingerprinted.
+        app.add_url_rule(
+            "/static/<path:filename>", endpoint="static", view_func=self.serve
+        )
+        app.url_defaults(self.fingerprint)
+
+    def fingerprint(self, endpoint, values):
+        if endpoint != "static":
+            return
+        assets, unused_files = self._get_files()
+        if values.get("filename") in assets:
+            values["filename"] = assets[values["filename"]]["fingerprinted"]
+
+    def serve(self, filename):
+        unused_assets, files = self._get_files()
+        if filename not in files:
+            abort(404)
+        asset, cache = files[filename]
+
+        encoding = next(
+            (e for e in ENCODINGS if e in asset and request.accept_encodings[e]),
+            "identity",
+        )
+        # Each encoding is a different representation, so it gets its own ETag.
+        etag = asset["etag"] + SUFFIXES[encoding].replace(".", "-")
+
+        response = Response(mimetype=asset["mimetype"])
+        response.headers["Cache-Control"] = cache
+        response.headers["Vary"] = "Accept-Encoding"
+        response.set_etag(etag)
+        if request.if_none_match.contains(etag):
+            response.status_code = 304
+            return response
+
+        response.set_data(asset[encoding])
+        if encoding != "identity":
+            response.headers["Content-Encoding"] = encoding
+        return response
+
+
+def hash_sources(static_dir=STATIC_DIR):
+    # Same digests as the ETags of build_assets, to compare a build with the sources.
+    digests = {}
+    for root, unused_dirs, files in walk(static_dir):
+        for name in files:
+            path = join(root, name)
+            with open(path, "rb") as f:
+                digest = sha256(f.read()).hexdigest()[:12]
+            digests[relpath(path, static_dir).replace("\\", "/")] = digest
+    return digests
+
+
+def find_assets():
+    # Uses the output of the build step if it's up to date with static/, else builds
+    # the assets in memory.
+    if exists(join(BUILD_DIR, MANIFEST)):
+        assets = load_assets()
+        built = {filename: asset["etag"] for filename, asset in assets.items()}
+        if built == hash_sources():
+            return assets
+    return build_assets()
+
+
+def get_static_assets():
+    return StaticAssets(find_assets)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="This script fingerprints and precompresses the static files."
+    )
+    parser.add_argument(
+        "-o", "--out", help="directory to write the build to", default=BUILD_DIR
+    )
+    args = parser.parse_args()
+
+    assets = build_assets()
+    save_assets(assets, args.out)
+    print(f"Built {len(assets)} static files into {args.out}")
@@ -0,0 +1,76 @@
+"""view_cache.py
+
+Author: Caio Batista de Melo
+Date Created: 2026-10-19
+Date Modified: 2026-10-19
+Description: Caches the state and the rendered pages of online games between moves.
+"""
+
+from hashlib import sha256
+from os import getenv
+from os.path import join
+from tempfile import gettempdir
+
+from cachelib import FileSystemCache
+from flask import current_app
+
+# A file cache is shared by every worker on the machine, so a move invalidates the
+# game for all of them. The state also expires on its own, which bounds how stale
+# another machine can be.
+STATE_TIMEOUT = int(getenv("VIEW_CACHE_STATE_TIMEOUT", 10))
+VIEW_TIMEOUT = int(getenv("VIEW_CACHE_VIEW_TIMEOUT", 300))
+
+
+def init_view_cache(app):
+    """Sets up the cache for an app, with its keys namespaced by the database.
+
+    Game ids are only unique within a database. Pages are keyed by the game's
+    creation timestamp and move count, so entries left by an earlier run are safe to
+    reuse, and the state expires within STATE_TIMEOUT.
+    """
+    database = sha256(app.config["SQLALCHEMY_DATABASE_URI"].encode()).hexdigest()[:16]
+    default = join(gettempdir(), "tic-tac-ception-view-cache", database)
+    app.config.setdefault("VIEW_CACHE_DIR", getenv("VIEW_CACHE_DIR", default))
+    cache = FileSystemCache(
+        app.config["VIEW_CACHE_DIR"], threshold=5000, default_timeout=VIEW_TIMEOUT
+    )
+    app.extensions["view_cache"] = (cache, database)
+
+
+def _get_cache():
+    return current_app.extensions["view_cache"]
+
+
+def get_game_state(game_id, load):
+    """Returns the cached state of a game, reading it with load(game_id) on a miss.
+
+    The state is a dict with the creation timestamp, the move count, the hashed
+    passwords and the board.
+    """
+    cache, database = _get_cache()
+    key = "{}/state/{}".format(database, game_id)
+    state = cache.get(key)
+    if state is None:
+        state = load(game_id)
+        if state is not None:
+            cache.set(key, state, timeout=STATE_TIMEOUT)
+    return state
+
+
+def get_view(game_id, state, role, render):
+    # A game only changes on a move, so a page is rendered once per move and role;
+    # the creation timestamp tells apart games that had the same id.
+    cache, database = _get_cache()
+    key = "{}/view/{}/{}/{}/{}".format(
+        database, game_id, state["timestamp"], state["count"], role
+    )
+    html = cache.get(key)
+    if html is None:
+        html = render()
+        cache.set(key, html)
+    return html
+
+
+def invalidate(game_id):
+    cache, database = _get_cache()
+    cache.delete("{}/state/{}".format(database, game_id))